@@ -0,0 +1,50 @@
+"""Add claim_clone_processing_retry function
+
+Revision ID: 0b8d2f4a6c13
+Revises: f1c3e5a7b9d2
+Create Date: 2026-10-18 14:05:39.216874
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b8d2f4a6c13'
+down_revision = 'f1c3e5a7b9d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Called via supabase.rpc("claim_clone_processing_retry", ...) from
+    # POST /clones/{id}/retry-processing. Marks the creator's clone as
+    # processing unless it already is, returning the status it replaced, so
+    # the ownership check, in-progress check and status update take one
+    # round trip and concurrent retries cannot both start.
+    # plpgsql so the body is not validated against the RAG status columns
+    # when the function is created.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION claim_clone_processing_retry(cid uuid, uid uuid)
+        RETURNS TABLE (clone_name text, previous_status text) AS $$
+        BEGIN
+            RETURN QUERY
+            UPDATE clones c SET
+                document_processing_status = 'processing',
+                rag_status = 'processing'
+            FROM (
+                SELECT id, document_processing_status
+                FROM clones
+                WHERE id = cid AND creator_id = uid
+                FOR UPDATE
+            ) old
+            WHERE c.id = old.id
+              AND old.document_processing_status IS DISTINCT FROM 'processing'
+            RETURNING c.name::text, old.document_processing_status::text;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS claim_clone_processing_retry(uuid, uuid)")
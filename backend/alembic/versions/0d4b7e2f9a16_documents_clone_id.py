@@ -0,0 +1,122 @@
+"""Link RAG documents to clones by id
+
+Revision ID: 0d4b7e2f9a16
+Revises: f6a3d8b1c5e2
+Create Date: 2026-10-18 18:10:42.358921
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0d4b7e2f9a16'
+down_revision = 'f6a3d8b1c5e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The initial schema created documents for the legacy SQLAlchemy model,
+    # but every reader and writer now uses the RAG layout (rag_core_service,
+    # rag_utils, rag_memory): name, document_link, openai_file_id, domain,
+    # created_by and client_name, with clone_id only on clone documents.
+    # Move the table to that layout. The legacy columns stay, but nothing
+    # writes them any more, so they become nullable.
+    op.execute("""
+        ALTER TABLE documents
+            ADD COLUMN name text,
+            ADD COLUMN document_link text,
+            ADD COLUMN openai_file_id text,
+            ADD COLUMN domain text,
+            ADD COLUMN created_by text,
+            ADD COLUMN client_name text,
+            ALTER COLUMN title DROP NOT NULL,
+            ALTER COLUMN file_name DROP NOT NULL,
+            ALTER COLUMN file_path DROP NOT NULL,
+            ALTER COLUMN file_type DROP NOT NULL,
+            ALTER COLUMN file_size_bytes DROP NOT NULL,
+            ALTER COLUMN clone_id DROP NOT NULL
+    """)
+
+    # Domain and expert documents belong to no clone, hence the nullable
+    # clone_id above. ON DELETE CASCADE so deleting a clone removes its
+    # documents on every cleanup path.
+    op.execute("ALTER TABLE documents DROP CONSTRAINT documents_clone_id_fkey")
+    op.execute("""
+        ALTER TABLE documents
+            ADD CONSTRAINT documents_clone_id_fkey
+            FOREIGN KEY (clone_id) REFERENCES clones(id) ON DELETE CASCADE
+    """)
+    op.create_index('ix_documents_client_name', 'documents', ['client_name'], unique=False)
+
+    # Existing rows all belong to a clone; fill the RAG columns the way
+    # rag_core_service writes them (client_name holds the clone id)
+    op.execute("""
+        UPDATE documents
+        SET name = title,
+            document_link = file_path,
+            client_name = clone_id::text
+    """)
+
+    # Documents linked by clone_id cannot be orphaned (the foreign key
+    # cascades); only unlinked ones still fall back to the name match
+    op.execute("""
+        CREATE OR REPLACE FUNCTION find_orphans()
+        RETURNS TABLE (sessions bigint, knowledge bigint, documents bigint) AS $$
+        BEGIN
+            RETURN QUERY SELECT
+                (SELECT count(*) FROM sessions s
+                 WHERE NOT EXISTS (SELECT 1 FROM clones c WHERE c.id = s.clone_id)),
+                (SELECT count(*) FROM knowledge k
+                 WHERE NOT EXISTS (SELECT 1 FROM clones c WHERE c.id = k.clone_id)),
+                (SELECT count(*) FROM documents d
+                 WHERE d.clone_id IS NULL
+                   AND d.client_name <> ''
+                   AND NOT EXISTS (SELECT 1 FROM clones c WHERE c.name = d.client_name));
+        END;
+        $$ LANGUAGE plpgsql STABLE
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION find_orphans()
+        RETURNS TABLE (sessions bigint, knowledge bigint, documents bigint) AS $$
+        BEGIN
+            RETURN QUERY SELECT
+                (SELECT count(*) FROM sessions s
+                 WHERE NOT EXISTS (SELECT 1 FROM clones c WHERE c.id = s.clone_id)),
+                (SELECT count(*) FROM knowledge k
+                 WHERE NOT EXISTS (SELECT 1 FROM clones c WHERE c.id = k.clone_id)),
+                (SELECT count(*) FROM documents d
+                 WHERE d.client_name <> ''
+                   AND NOT EXISTS (SELECT 1 FROM clones c WHERE c.name = d.client_name));
+        END;
+        $$ LANGUAGE plpgsql STABLE
+    """)
+
+    op.drop_index('ix_documents_client_name', table_name='documents')
+    op.execute("ALTER TABLE documents DROP CONSTRAINT documents_clone_id_fkey")
+    op.execute("""
+        ALTER TABLE documents
+            ADD CONSTRAINT documents_clone_id_fkey
+            FOREIGN KEY (clone_id) REFERENCES clones(id)
+    """)
+
+    # Fails if RAG-only rows (no clone or legacy fields) were written since
+    op.execute("""
+        ALTER TABLE documents
+            DROP COLUMN name,
+            DROP COLUMN document_link,
+            DROP COLUMN openai_file_id,
+            DROP COLUMN domain,
+            DROP COLUMN created_by,
+            DROP COLUMN client_name,
+            ALTER COLUMN title SET NOT NULL,
+            ALTER COLUMN file_name SET NOT NULL,
+            ALTER COLUMN file_path SET NOT NULL,
+            ALTER COLUMN file_type SET NOT NULL,
+            ALTER COLUMN file_size_bytes SET NOT NULL,
+            ALTER COLUMN clone_id SET NOT NULL
+    """)
@@ -0,0 +1,57 @@
+"""Add delete_orphans function
+
+Revision ID: 2b9e6c4d1f58
+Revises: 0d4b7e2f9a16
+Create Date: 2026-10-18 18:37:05.912483
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2b9e6c4d1f58'
+down_revision = '0d4b7e2f9a16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Called via supabase.rpc("delete_orphans") from
+    # POST /clones/cleanup/orphaned-data?auto_cleanup=true. Deletes the rows
+    # find_orphans() counts, using the same predicates, as one set-based
+    # DELETE per table in a single transaction, and returns how many rows
+    # each removed. Orphan ids never leave the database.
+    # plpgsql so the body is not validated against the RAG tables when the
+    # function is created.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION delete_orphans()
+        RETURNS TABLE (sessions bigint, knowledge bigint, documents bigint) AS $$
+        BEGIN
+            RETURN QUERY
+            WITH deleted_sessions AS (
+                DELETE FROM sessions s
+                WHERE NOT EXISTS (SELECT 1 FROM clones c WHERE c.id = s.clone_id)
+                RETURNING 1
+            ), deleted_knowledge AS (
+                DELETE FROM knowledge k
+                WHERE NOT EXISTS (SELECT 1 FROM clones c WHERE c.id = k.clone_id)
+                RETURNING 1
+            ), deleted_documents AS (
+                DELETE FROM documents d
+                WHERE d.clone_id IS NULL
+                  AND d.client_name <> ''
+                  AND NOT EXISTS (SELECT 1 FROM clones c WHERE c.name = d.client_name)
+                RETURNING 1
+            )
+            SELECT
+                (SELECT count(*) FROM deleted_sessions),
+                (SELECT count(*) FROM deleted_knowledge),
+                (SELECT count(*) FROM deleted_documents);
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS delete_orphans()")
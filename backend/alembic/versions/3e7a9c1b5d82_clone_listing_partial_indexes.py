@@ -0,0 +1,54 @@
+"""Partial keyset indexes for clone listings
+
+Revision ID: 3e7a9c1b5d82
+Revises: 0b8d2f4a6c13
+Create Date: 2026-10-18 15:22:08.437190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3e7a9c1b5d82'
+down_revision = '0b8d2f4a6c13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Listings page with ORDER BY created_at DESC, id DESC (keyset on both),
+    # so the indexes carry id as a tie-breaker. GET /clones only ever reads
+    # published, active clones, so those indexes are partial and skip drafts.
+    op.drop_index('clones_published_created_idx', table_name='clones')
+    op.drop_index('clones_category_created_idx', table_name='clones')
+    op.drop_index('clones_creator_created_idx', table_name='clones')
+
+    op.create_index(
+        'clones_published_created_idx', 'clones',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text('is_published AND is_active')
+    )
+    op.create_index(
+        'clones_category_created_idx', 'clones',
+        ['category', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text('is_published AND is_active')
+    )
+    # GET /clones/my-clones lists drafts too, so this one stays full
+    op.create_index(
+        'clones_creator_created_idx', 'clones',
+        ['creator_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('clones_creator_created_idx', table_name='clones')
+    op.drop_index('clones_category_created_idx', table_name='clones')
+    op.drop_index('clones_published_created_idx', table_name='clones')
+
+    op.create_index('clones_published_created_idx', 'clones', ['is_published', 'is_active', sa.text('created_at DESC')], unique=False)
+    op.create_index('clones_creator_created_idx', 'clones', ['creator_id', sa.text('created_at DESC')], unique=False)
+    op.create_index('clones_category_created_idx', 'clones', ['category', 'is_published', sa.text('created_at DESC')], unique=False)
@@ -0,0 +1,44 @@
+"""Add unpublish_clone function
+
+Revision ID: 5c2e8a0d7f19
+Revises: 3e7a9c1b5d82
+Create Date: 2026-10-18 15:48:52.610374
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c2e8a0d7f19'
+down_revision = '3e7a9c1b5d82'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Called via supabase.rpc("unpublish_clone", ...) from
+    # POST /clones/{id}/unpublish. Unpublishes the creator's clone only if it
+    # has no active sessions, so the session check and the update are one
+    # round trip and a session cannot start between them. Returns no row
+    # when nothing was updated; the API then works out why.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION unpublish_clone(cid uuid, uid uuid)
+        RETURNS TABLE (id uuid) AS $$
+        BEGIN
+            RETURN QUERY
+            UPDATE clones c SET is_published = false
+            WHERE c.id = cid
+              AND c.creator_id = uid
+              AND NOT EXISTS (
+                  SELECT 1 FROM sessions s
+                  WHERE s.clone_id = cid AND s.status = 'active'
+              )
+            RETURNING c.id;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS unpublish_clone(uuid, uuid)")
@@ -0,0 +1,41 @@
+"""Set clones.published_at on first publish via trigger
+
+Revision ID: 7c1e9a2b5d40
+Revises: 4a6de5a6c769
+Create Date: 2026-10-18 09:12:04.113250
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e9a2b5d40'
+down_revision = '4a6de5a6c769'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Lets the API publish a clone with a single ownership-filtered UPDATE
+    # instead of reading published_at first
+    op.execute("""
+        CREATE OR REPLACE FUNCTION clones_set_published_at() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.is_published AND NEW.published_at IS NULL THEN
+                NEW.published_at := now();
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER clones_set_published_at
+        BEFORE INSERT OR UPDATE OF is_published ON clones
+        FOR EACH ROW EXECUTE FUNCTION clones_set_published_at()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS clones_set_published_at ON clones")
+    op.execute("DROP FUNCTION IF EXISTS clones_set_published_at()")
@@ -0,0 +1,59 @@
+"""Add clone_resource_counts function
+
+Revision ID: 8d1f3b6e2a47
+Revises: 5c2e8a0d7f19
+Create Date: 2026-10-18 16:31:17.904562
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d1f3b6e2a47'
+down_revision = '5c2e8a0d7f19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Called via supabase.rpc("clone_resource_counts", ...) by
+    # CloneCleanupService when gathering a clone's resources (deletion
+    # preview and cleanup). Returns every related table's row count in one
+    # round trip instead of one HEAD request per table. Several tables are
+    # linked by clone or expert name rather than a foreign key, so a
+    # PostgREST embed cannot reach them. A NULL name matches no rows, so
+    # clones without a name (or RAG expert) count 0 there.
+    # plpgsql so the body is not validated against the RAG tables when the
+    # function is created.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION clone_resource_counts(cid uuid, clone_name text, expert_name text)
+        RETURNS TABLE (
+            knowledge bigint,
+            sessions bigint,
+            clone_qa_training bigint,
+            documents bigint,
+            experts bigint,
+            assistants bigint,
+            vector_stores bigint
+        ) AS $$
+        BEGIN
+            RETURN QUERY SELECT
+                (SELECT count(*) FROM knowledge k WHERE k.clone_id = cid),
+                (SELECT count(*) FROM sessions s WHERE s.clone_id = cid),
+                (SELECT count(*) FROM clone_qa_training q WHERE q.clone_id = cid),
+                (SELECT count(*) FROM documents d
+                 WHERE d.client_name = clone_resource_counts.clone_name),
+                (SELECT count(*) FROM experts e
+                 WHERE e.name = clone_resource_counts.expert_name),
+                (SELECT count(*) FROM assistants a
+                 WHERE a.expert_name = clone_resource_counts.expert_name),
+                (SELECT count(*) FROM vector_stores v
+                 WHERE v.expert_name = clone_resource_counts.expert_name);
+        END;
+        $$ LANGUAGE plpgsql STABLE
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS clone_resource_counts(uuid, text, text)")
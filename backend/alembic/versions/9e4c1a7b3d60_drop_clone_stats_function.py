@@ -0,0 +1,42 @@
+"""Drop clone_stats aggregation function
+
+Revision ID: 9e4c1a7b3d60
+Revises: 2b9e6c4d1f58
+Create Date: 2026-10-18 19:12:44.208157
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4c1a7b3d60'
+down_revision = '2b9e6c4d1f58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # GET /clones/{id}/stats reads the counters the sessions_bump_clone_stats
+    # trigger maintains on clones, so nothing calls clone_stats any more.
+    op.execute("DROP FUNCTION IF EXISTS clone_stats(uuid)")
+
+
+def downgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION clone_stats(cid uuid)
+        RETURNS TABLE (
+            total_sessions bigint,
+            total_duration_minutes bigint,
+            total_earnings double precision,
+            average_rating double precision
+        ) AS $$
+            SELECT
+                COUNT(*),
+                COALESCE(SUM(duration_minutes), 0),
+                COALESCE(SUM(total_cost), 0),
+                COALESCE(AVG(user_rating), 0)
+            FROM sessions
+            WHERE clone_id = cid
+        $$ LANGUAGE sql STABLE
+    """)
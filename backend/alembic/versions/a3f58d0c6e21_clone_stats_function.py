@@ -0,0 +1,41 @@
+"""Add clone_stats aggregation function
+
+Revision ID: a3f58d0c6e21
+Revises: 7c1e9a2b5d40
+Create Date: 2026-10-18 09:40:51.872301
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f58d0c6e21'
+down_revision = '7c1e9a2b5d40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Called via supabase.rpc("clone_stats", {"cid": ...}) from GET /clones/{id}/stats
+    op.execute("""
+        CREATE OR REPLACE FUNCTION clone_stats(cid uuid)
+        RETURNS TABLE (
+            total_sessions bigint,
+            total_duration_minutes bigint,
+            total_earnings double precision,
+            average_rating double precision
+        ) AS $$
+            SELECT
+                COUNT(*),
+                COALESCE(SUM(duration_minutes), 0),
+                COALESCE(SUM(total_cost), 0),
+                COALESCE(AVG(user_rating), 0)
+            FROM sessions
+            WHERE clone_id = cid
+        $$ LANGUAGE sql STABLE
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS clone_stats(uuid)")
@@ -0,0 +1,45 @@
+"""Add find_orphans function
+
+Revision ID: a4e7c2d9f031
+Revises: e2b6f9c4a813
+Create Date: 2026-10-18 17:04:26.183950
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4e7c2d9f031'
+down_revision = 'e2b6f9c4a813'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Called via supabase.rpc("find_orphans") from
+    # POST /clones/cleanup/orphaned-data. Counts sessions and knowledge rows
+    # whose clone no longer exists, and documents whose client_name matches
+    # no clone, as anti-joins in the database, so the API no longer pulls
+    # every clone, session, knowledge and document row to compare them.
+    # plpgsql so the body is not validated against the RAG tables when the
+    # function is created.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION find_orphans()
+        RETURNS TABLE (sessions bigint, knowledge bigint, documents bigint) AS $$
+        BEGIN
+            RETURN QUERY SELECT
+                (SELECT count(*) FROM sessions s
+                 WHERE NOT EXISTS (SELECT 1 FROM clones c WHERE c.id = s.clone_id)),
+                (SELECT count(*) FROM knowledge k
+                 WHERE NOT EXISTS (SELECT 1 FROM clones c WHERE c.id = k.clone_id)),
+                (SELECT count(*) FROM documents d
+                 WHERE d.client_name <> ''
+                   AND NOT EXISTS (SELECT 1 FROM clones c WHERE c.name = d.client_name));
+        END;
+        $$ LANGUAGE plpgsql STABLE
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS find_orphans()")
@@ -0,0 +1,82 @@
+"""Add delete_clone_cascade function
+
+Revision ID: c7f1a5e3b926
+Revises: a4e7c2d9f031
+Create Date: 2026-10-18 17:26:51.540318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7f1a5e3b926'
+down_revision = 'a4e7c2d9f031'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Called via supabase.rpc("delete_clone_cascade", ...) by
+    # CloneCleanupService. Deletes the creator's clone and every related
+    # row in one transaction, so a failure part way leaves nothing orphaned,
+    # and returns the number of rows deleted per table. Returns no row when
+    # the clone is missing or owned by someone else.
+    # The steps mirror the service's old per-table sequence; tables (or
+    # columns) that do not exist in this database are skipped, and values
+    # are passed as literals so they coerce to each column's type (uuid or
+    # text).
+    op.execute("""
+        CREATE OR REPLACE FUNCTION delete_clone_cascade(cid uuid, uid uuid, clone_name text, expert_name text)
+        RETURNS TABLE (table_name text, deleted_count bigint) AS $$
+        DECLARE
+            step record;
+            n bigint;
+        BEGIN
+            PERFORM 1 FROM clones c WHERE c.id = cid AND c.creator_id = uid FOR UPDATE;
+            IF NOT FOUND THEN
+                RETURN;
+            END IF;
+
+            FOR step IN
+                SELECT s.tbl, s.col, s.val
+                FROM (VALUES
+                    (1, 'sessions', 'clone_id', cid::text),
+                    (2, 'knowledge', 'clone_id', cid::text),
+                    (3, 'clone_qa_training', 'clone_id', cid::text),
+                    (4, 'assistants', 'expert_name', NULLIF(delete_clone_cascade.expert_name, '')),
+                    (5, 'assistants', 'client_name', NULLIF(delete_clone_cascade.clone_name, '')),
+                    (6, 'vector_stores', 'expert_name', NULLIF(delete_clone_cascade.expert_name, '')),
+                    (7, 'vector_stores', 'client_name', NULLIF(delete_clone_cascade.clone_name, '')),
+                    (8, 'documents', 'client_name', NULLIF(delete_clone_cascade.clone_name, '')),
+                    (9, 'experts', 'name', NULLIF(delete_clone_cascade.expert_name, '')),
+                    (10, 'rag_chunks', 'clone_id', cid::text),
+                    (11, 'rag_embeddings', 'clone_id', cid::text),
+                    (12, 'rag_processing_status', 'clone_id', cid::text),
+                    (13, 'conversations', 'clone_id', cid::text),
+                    (14, 'chat_messages', 'clone_id', cid::text),
+                    (15, 'chat_threads', 'clone_id', cid::text),
+                    (16, 'clones', 'id', cid::text)
+                ) AS s(ord, tbl, col, val)
+                WHERE s.val IS NOT NULL
+                ORDER BY s.ord
+            LOOP
+                CONTINUE WHEN NOT EXISTS (
+                    SELECT 1 FROM pg_attribute a
+                    WHERE a.attrelid = to_regclass(step.tbl)
+                      AND a.attname = step.col
+                      AND NOT a.attisdropped
+                );
+                EXECUTE format('DELETE FROM %I WHERE %I = %L', step.tbl, step.col, step.val);
+                GET DIAGNOSTICS n = ROW_COUNT;
+                table_name := step.tbl;
+                deleted_count := n;
+                RETURN NEXT;
+            END LOOP;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS delete_clone_cascade(uuid, uuid, text, text)")
@@ -0,0 +1,41 @@
+"""Add clone listing indexes and trigram search column
+
+Revision ID: c9d4e7f1a2b3
+Revises: a3f58d0c6e21
+Create Date: 2026-10-18 10:05:27.540918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9d4e7f1a2b3'
+down_revision = 'a3f58d0c6e21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Match GET /clones and /clones/my-clones: filter, then ORDER BY created_at DESC LIMIT n
+    op.create_index('clones_published_created_idx', 'clones', ['is_published', 'is_active', sa.text('created_at DESC')], unique=False)
+    op.create_index('clones_creator_created_idx', 'clones', ['creator_id', sa.text('created_at DESC')], unique=False)
+    op.create_index('clones_category_created_idx', 'clones', ['category', 'is_published', sa.text('created_at DESC')], unique=False)
+    
+    # Single searchable text column so the listing search is one trigram-indexed ILIKE
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("""
+        ALTER TABLE clones ADD COLUMN search_text text
+        GENERATED ALWAYS AS (
+            coalesce(name, '') || ' ' || coalesce(description, '') || ' ' || coalesce(bio, '')
+        ) STORED
+    """)
+    op.execute("CREATE INDEX clones_search_trgm_idx ON clones USING gin (search_text gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS clones_search_trgm_idx")
+    op.drop_column('clones', 'search_text')
+    op.drop_index('clones_category_created_idx', table_name='clones')
+    op.drop_index('clones_creator_created_idx', table_name='clones')
+    op.drop_index('clones_published_created_idx', table_name='clones')
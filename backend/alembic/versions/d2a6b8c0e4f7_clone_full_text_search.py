@@ -0,0 +1,43 @@
+"""Replace clone trigram search column with full-text search
+
+Revision ID: d2a6b8c0e4f7
+Revises: c9d4e7f1a2b3
+Create Date: 2026-10-18 10:31:12.006734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a6b8c0e4f7'
+down_revision = 'c9d4e7f1a2b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Listing search now uses the GIN-indexed tsvector below
+    op.execute("DROP INDEX IF EXISTS clones_search_trgm_idx")
+    op.drop_column('clones', 'search_text')
+    
+    op.execute("""
+        ALTER TABLE clones ADD COLUMN search_tsv tsvector
+        GENERATED ALWAYS AS (
+            to_tsvector('english', coalesce(name, '') || ' ' || coalesce(description, '') || ' ' || coalesce(bio, ''))
+        ) STORED
+    """)
+    op.execute("CREATE INDEX clones_search_tsv_idx ON clones USING gin (search_tsv)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS clones_search_tsv_idx")
+    op.drop_column('clones', 'search_tsv')
+    
+    op.execute("""
+        ALTER TABLE clones ADD COLUMN search_text text
+        GENERATED ALWAYS AS (
+            coalesce(name, '') || ' ' || coalesce(description, '') || ' ' || coalesce(bio, '')
+        ) STORED
+    """)
+    op.execute("CREATE INDEX clones_search_trgm_idx ON clones USING gin (search_text gin_trgm_ops)")
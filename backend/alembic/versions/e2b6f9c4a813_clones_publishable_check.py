@@ -0,0 +1,62 @@
+"""Require name, description and category on published clones
+
+Revision ID: e2b6f9c4a813
+Revises: 8d1f3b6e2a47
+Create Date: 2026-10-18 16:52:40.771308
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b6f9c4a813'
+down_revision = '8d1f3b6e2a47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # POST /clones/{id}/publish sets is_published in one UPDATE and maps a
+    # violation (SQLSTATE 23514) to a 400, so the fields are validated in
+    # the same statement that publishes.
+    # Postgres checks the constraint on every UPDATE of a row, so a published
+    # clone that already breaks it would fail every later write, including
+    # the sessions_bump_clone_stats trigger's counter update. A schema change
+    # must not unpublish creators' clones, so stop with the offending ids;
+    # fix those rows by hand and rerun the upgrade.
+    op.execute("""
+        DO $$
+        DECLARE
+            offending text;
+        BEGIN
+            SELECT string_agg(id::text, ', ' ORDER BY id) INTO offending
+            FROM clones
+            WHERE is_published AND (
+                COALESCE(name, '') = ''
+                OR COALESCE(description, '') = ''
+                OR COALESCE(category, '') = ''
+            );
+            IF offending IS NOT NULL THEN
+                RAISE EXCEPTION 'Published clones without a name, description or category: %', offending
+                    USING HINT = 'Fill in those fields or unpublish the clones, then rerun the migration.';
+            END IF;
+        END
+        $$
+    """)
+    # Added NOT VALID and validated separately so the full-table check does
+    # not hold the ACCESS EXCLUSIVE lock taken by ADD CONSTRAINT
+    op.execute("""
+        ALTER TABLE clones ADD CONSTRAINT clones_publishable CHECK (
+            NOT is_published OR (
+                COALESCE(name, '') <> ''
+                AND COALESCE(description, '') <> ''
+                AND COALESCE(category, '') <> ''
+            )
+        ) NOT VALID
+    """)
+    op.execute("ALTER TABLE clones VALIDATE CONSTRAINT clones_publishable")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE clones DROP CONSTRAINT IF EXISTS clones_publishable")
@@ -0,0 +1,102 @@
+"""Maintain denormalized clone session stats with triggers
+
+Revision ID: e5b7c9d1f3a8
+Revises: d2a6b8c0e4f7
+Create Date: 2026-10-18 12:16:03.418920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b7c9d1f3a8'
+down_revision = 'd2a6b8c0e4f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('clones', sa.Column('total_duration_minutes', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from the existing sessions before the triggers take over
+    op.execute("""
+        UPDATE clones SET
+            total_sessions = 0,
+            total_duration_minutes = 0,
+            total_earnings = 0,
+            average_rating = 0,
+            total_ratings = 0
+    """)
+    op.execute("""
+        UPDATE clones c SET
+            total_sessions = s.total_sessions,
+            total_duration_minutes = s.total_duration_minutes,
+            total_earnings = s.total_earnings,
+            average_rating = s.average_rating,
+            total_ratings = s.total_ratings
+        FROM (
+            SELECT
+                clone_id,
+                COUNT(*) AS total_sessions,
+                COALESCE(SUM(duration_minutes), 0) AS total_duration_minutes,
+                COALESCE(SUM(total_cost), 0) AS total_earnings,
+                COALESCE(AVG(user_rating), 0) AS average_rating,
+                COUNT(user_rating) AS total_ratings
+            FROM sessions
+            GROUP BY clone_id
+        ) s
+        WHERE c.id = s.clone_id
+    """)
+
+    # Apply each session's contribution incrementally; an UPDATE removes the
+    # old row's contribution and adds the new one (which also covers clone_id
+    # changes). SET expressions see the pre-update clone row, so
+    # average_rating and total_ratings are updated consistently.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_clone_stats()
+        RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE clones SET
+                    total_sessions = COALESCE(total_sessions, 0) - 1,
+                    total_duration_minutes = total_duration_minutes - COALESCE(OLD.duration_minutes, 0),
+                    total_earnings = COALESCE(total_earnings, 0) - COALESCE(OLD.total_cost, 0),
+                    average_rating = CASE
+                        WHEN OLD.user_rating IS NULL THEN average_rating
+                        WHEN COALESCE(total_ratings, 0) <= 1 THEN 0
+                        ELSE (average_rating * total_ratings - OLD.user_rating) / (total_ratings - 1)
+                    END,
+                    total_ratings = COALESCE(total_ratings, 0) - (OLD.user_rating IS NOT NULL)::int
+                WHERE id = OLD.clone_id;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE clones SET
+                    total_sessions = COALESCE(total_sessions, 0) + 1,
+                    total_duration_minutes = total_duration_minutes + COALESCE(NEW.duration_minutes, 0),
+                    total_earnings = COALESCE(total_earnings, 0) + COALESCE(NEW.total_cost, 0),
+                    average_rating = CASE
+                        WHEN NEW.user_rating IS NULL THEN average_rating
+                        ELSE (COALESCE(average_rating, 0) * COALESCE(total_ratings, 0) + NEW.user_rating)
+                             / (COALESCE(total_ratings, 0) + 1)
+                    END,
+                    total_ratings = COALESCE(total_ratings, 0) + (NEW.user_rating IS NOT NULL)::int
+                WHERE id = NEW.clone_id;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER sessions_bump_clone_stats
+        AFTER INSERT OR DELETE OR UPDATE OF clone_id, duration_minutes, total_cost, user_rating ON sessions
+        FOR EACH ROW EXECUTE FUNCTION bump_clone_stats()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS sessions_bump_clone_stats ON sessions")
+    op.execute("DROP FUNCTION IF EXISTS bump_clone_stats()")
+    op.drop_column('clones', 'total_duration_minutes')
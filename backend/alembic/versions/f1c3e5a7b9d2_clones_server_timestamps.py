@@ -0,0 +1,60 @@
+"""Server-side created_at/updated_at for clones
+
+Revision ID: f1c3e5a7b9d2
+Revises: e5b7c9d1f3a8
+Create Date: 2026-10-18 12:41:27.905116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c3e5a7b9d2'
+down_revision = 'e5b7c9d1f3a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Columns are naive timestamps holding UTC, as the API used to write them
+    op.execute("""
+        ALTER TABLE clones
+            ALTER COLUMN created_at SET DEFAULT timezone('utc', now()),
+            ALTER COLUMN updated_at SET DEFAULT timezone('utc', now())
+    """)
+
+    # The API no longer sends updated_at on writes. Counter-only updates from
+    # the sessions_bump_clone_stats trigger are skipped: the processing
+    # timestamps and the processing-status ETag are derived from updated_at,
+    # and session activity does not change those.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION clones_set_updated_at() RETURNS trigger AS $$
+        DECLARE
+            stats_columns text[] := ARRAY[
+                'total_sessions', 'total_duration_minutes', 'total_earnings',
+                'average_rating', 'total_ratings', 'updated_at'
+            ];
+        BEGIN
+            IF (to_jsonb(NEW) - stats_columns) IS DISTINCT FROM (to_jsonb(OLD) - stats_columns) THEN
+                NEW.updated_at := timezone('utc', now());
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER clones_set_updated_at
+        BEFORE UPDATE ON clones
+        FOR EACH ROW EXECUTE FUNCTION clones_set_updated_at()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS clones_set_updated_at ON clones")
+    op.execute("DROP FUNCTION IF EXISTS clones_set_updated_at()")
+    op.execute("""
+        ALTER TABLE clones
+            ALTER COLUMN created_at DROP DEFAULT,
+            ALTER COLUMN updated_at DROP DEFAULT
+    """)
@@ -0,0 +1,50 @@
+"""Indexes for the orphan anti-joins
+
+Revision ID: f6a3d8b1c5e2
+Revises: c7f1a5e3b926
+Create Date: 2026-10-18 17:49:13.627094
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6a3d8b1c5e2'
+down_revision = 'c7f1a5e3b926'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # find_orphans() probes clones by name for every document; without an
+    # index each probe scans clones. sessions.clone_id is already covered
+    # by ix_sessions_clone_status and clones.id by the primary key.
+    op.create_index('ix_clones_name', 'clones', ['name'], unique=False)
+
+    # knowledge and documents.client_name belong to the RAG schema, which
+    # these migrations do not create, so only index them where they exist
+    op.execute("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_attribute
+                WHERE attrelid = to_regclass('knowledge') AND attname = 'clone_id' AND NOT attisdropped
+            ) THEN
+                CREATE INDEX IF NOT EXISTS ix_knowledge_clone_id ON knowledge (clone_id);
+            END IF;
+            IF EXISTS (
+                SELECT 1 FROM pg_attribute
+                WHERE attrelid = to_regclass('documents') AND attname = 'client_name' AND NOT attisdropped
+            ) THEN
+                CREATE INDEX IF NOT EXISTS ix_documents_client_name ON documents (client_name);
+            END IF;
+        END
+        $$
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_documents_client_name")
+    op.execute("DROP INDEX IF EXISTS ix_knowledge_clone_id")
+    op.drop_index('ix_clones_name', table_name='clones')
@@ -1,26 +1,445 @@
 """
 Clone Management API endpoints for CloneAI - Supabase Integration
 """
+import asyncio
+import base64
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Optional
+from typing import Annotated, Dict, List, Optional, Tuple
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Path, Query, UploadFile, File
+from fastapi.responses import Response
 from fastapi.security import HTTPAuthorizationCredentials
+from pydantic import TypeAdapter
+import httpx
 import structlog
 import tempfile
 import os
+from postgrest.exceptions import APIError
 
-from app.database import get_supabase, get_service_supabase
-from app.core.supabase_auth import get_current_user_id, security
+from app.database import get_supabase, get_service_supabase, get_redis, get_db_pool
+from app.services.rag_cache import rag_response_cache
+from app.services.rag_integration_service import RAG_READY_KEY
+from app.services.clone_cleanup_service import CloneCleanupService, cleanup_clone_comprehensive, verify_cleanup_capability
+from app.services.elevenlabs_service import get_elevenlabs_service
+from app.services.rag_client import RAGClient
+from app.core.supabase_auth import get_current_user_id, require_role, security
 from app.models.schemas import (
     CloneCreate, CloneUpdate, CloneResponse, CloneListResponse,
-    PaginationInfo, DocumentProcessingRequest, KnowledgeProcessingStatus
+    PaginationInfo, DocumentProcessingRequest, KnowledgeProcessingStatus,
+    BatchStatusRequest
 )
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="/clones", tags=["Clone Management"])
 
+# Clone id path parameter: malformed ids are rejected with a 422 during
+# request validation instead of costing a PostgREST round trip to fail
+CloneId = Annotated[str, Path(pattern=r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")]
+
+# Columns needed to build a CloneResponse; avoids shipping search_tsv and
+# processing metadata on every read
+_CLONE_COLS = (
+    "id,creator_id,name,description,category,expertise_areas,avatar_url,base_price,bio,"
+    "personality_traits,communication_style,languages,average_rating,total_sessions,"
+    "total_earnings,is_published,is_active,voice_id,created_at,updated_at,published_at"
+)
+
+# Large columns the knowledge processing endpoints never read. The RAG
+# processing columns are not in the migrated schema and cannot be named in a
+# projection, so pool reads subtract these from the full row instead.
+_CLONE_ROW_SKIP_COLS = ["search_tsv", "system_prompt", "communication_style"]
+_CLONE_STATUS_SKIP_COLS = _CLONE_ROW_SKIP_COLS + [
+    "bio", "description", "personality_traits", "expertise_areas", "languages"
+]
+
+# Short-lived in-process cache of full clone rows for the knowledge processing
+# endpoints, which are polled repeatedly by the frontend
+CLONE_ROW_CACHE_TTL = 5
+CLONE_ROW_CACHE_MAXSIZE = 4096
+_clone_row_cache: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+_clone_row_pending: Dict[Tuple[str, Optional[str]], asyncio.Future] = {}
+
+# Redis cache TTLs (seconds) for published clone reads
+CLONE_LIST_CACHE_TTL = 60
+CLONE_CACHE_TTL = 300
+
+# How long a /cleanup/health capability probe is reused (seconds), so
+# monitoring scrapes do not each fan out to Supabase and OpenAI
+CLEANUP_HEALTH_CACHE_TTL = 10
+_cleanup_health_cache: Optional[Tuple[float, dict]] = None
+
+# Deletion previews are re-requested by the confirmation dialog; reuse one
+# for a short while, keyed by (clone_id, user_id). Kept short so the active
+# session count does not go stale while the dialog is open.
+DELETION_PREVIEW_CACHE_TTL = 15
+DELETION_PREVIEW_CACHE_MAXSIZE = 1024
+_deletion_preview_cache: "OrderedDict[Tuple[str, str], Tuple[float, dict]]" = OrderedDict()
+# Storage URLs listed in a deletion preview; the dialog only shows a sample
+# and the counts cover the rest
+DELETION_PREVIEW_MAX_FILE_URLS = 50
+
+# Most clones accepted by POST /clones/bulk in one request
+CLONE_BULK_CREATE_MAX = 50
+
+# Rows per page when the orphan scan falls back to reading tables in Python
+ORPHAN_SCAN_BATCH_SIZE = 5000
+
+# In-process cache of serialized published clones in front of Redis for
+# get_clone, which every chat page load hits. Kept short because other
+# workers only see an update once their copy expires.
+CLONE_BODY_CACHE_TTL = 30
+CLONE_BODY_CACHE_MAXSIZE = 10_000
+_clone_body_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+
+async def _cache_get(key: str) -> Optional[bytes]:
+    """Read a cached response body; cache failures are treated as misses"""
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        return await redis.get(key)
+    except Exception as e:
+        logger.warning("Clone cache read failed", error=str(e), key=key)
+        return None
+
+
+async def _cache_set(key: str, value: str, ttl: int):
+    """Store a response body in the cache; failures are logged and ignored"""
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.set(key, value, ex=ttl)
+    except Exception as e:
+        logger.warning("Clone cache write failed", error=str(e), key=key)
+
+
+def _clone_body_get(clone_id: str) -> Optional[bytes]:
+    """Return a clone's serialized response from the in-process cache, if fresh"""
+    entry = _clone_body_cache.get(clone_id)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        del _clone_body_cache[clone_id]
+        return None
+    _clone_body_cache.move_to_end(clone_id)
+    return entry[1]
+
+
+def _clone_body_set(clone_id: str, body: bytes):
+    """Store a clone's serialized response in the in-process cache"""
+    _clone_body_cache[clone_id] = (time.monotonic() + CLONE_BODY_CACHE_TTL, body)
+    _clone_body_cache.move_to_end(clone_id)
+    while len(_clone_body_cache) > CLONE_BODY_CACHE_MAXSIZE:
+        _clone_body_cache.popitem(last=False)
+
+
+async def _get_cleanup_capability() -> dict:
+    """Return verify_cleanup_capability(), probing again only once the last result expires"""
+    global _cleanup_health_cache
+    if _cleanup_health_cache is not None and _cleanup_health_cache[0] > time.monotonic():
+        return _cleanup_health_cache[1]
+    
+    capabilities = await verify_cleanup_capability()
+    _cleanup_health_cache = (time.monotonic() + CLEANUP_HEALTH_CACHE_TTL, capabilities)
+    return capabilities
+
+
+async def _invalidate_clone_cache(clone_id: Optional[str] = None):
+    """
+    Drop the cached clone (if given), its cached RAG answers, and every
+    cached clone listing page
+    """
+    if clone_id:
+        _forget_clone_row(clone_id)
+        _clone_body_cache.pop(clone_id, None)
+        rag_response_cache.invalidate(clone_id)
+        for key in [key for key in _deletion_preview_cache if key[0] == clone_id]:
+            del _deletion_preview_cache[key]
+    
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        if clone_id:
+            await redis.delete(f"clones:id:{clone_id}", RAG_READY_KEY.format(clone_id=clone_id))
+        list_keys = [key async for key in redis.scan_iter(match="clones:list:*")]
+        if list_keys:
+            await redis.delete(*list_keys)
+    except Exception as e:
+        logger.warning("Clone cache invalidation failed", error=str(e), clone_id=clone_id)
+
+
+async def _execute(query):
+    """
+    Run a supabase-py query builder in a worker thread.
+
+    The client is synchronous, so calling .execute() directly from a handler
+    blocks the event loop for the whole PostgREST round trip.
+    """
+    return await asyncio.to_thread(query.execute)
+
+
+async def _load_clone(supabase_client, clone_id: str, creator_id: Optional[str] = None) -> Optional[dict]:
+    """
+    Fetch a full clone row, served from a short TTL cache when possible.
+    
+    With creator_id the row is only returned if that user created the clone.
+    Concurrent misses for the same lookup share a single database read.
+    Returns None if no row matches (misses are not cached).
+    """
+    entry = _clone_row_cache.get(clone_id)
+    if entry is not None and entry[0] > time.monotonic():
+        _clone_row_cache.move_to_end(clone_id)
+        row = entry[1]
+        if creator_id is not None and row["creator_id"] != creator_id:
+            return None
+        return row
+    
+    pending_key = (clone_id, creator_id)
+    pending = _clone_row_pending.get(pending_key)
+    if pending is not None:
+        return await asyncio.shield(pending)
+    
+    pending = asyncio.ensure_future(_fetch_clone_row(supabase_client, clone_id, creator_id))
+    _clone_row_pending[pending_key] = pending
+    try:
+        row = await asyncio.shield(pending)
+    finally:
+        _clone_row_pending.pop(pending_key, None)
+    
+    if row is None:
+        return None
+    
+    _clone_row_cache[clone_id] = (time.monotonic() + CLONE_ROW_CACHE_TTL, row)
+    _clone_row_cache.move_to_end(clone_id)
+    while len(_clone_row_cache) > CLONE_ROW_CACHE_MAXSIZE:
+        _clone_row_cache.popitem(last=False)
+    
+    return row
+
+
+async def _fetch_clone_row(supabase_client, clone_id: str, creator_id: Optional[str] = None) -> Optional[dict]:
+    """
+    Read one clone row, through the asyncpg pool when it is configured.
+    
+    Pool reads return the row as jsonb, which already has the shapes PostgREST
+    returns (string ids and ISO timestamps), minus _CLONE_ROW_SKIP_COLS.
+    """
+    pool = get_db_pool()
+    if pool is not None:
+        # RAG processing columns are not part of the migrated schema, so take
+        # the whole row and drop the known-unneeded columns server side;
+        # callers fall back to .get() defaults
+        if creator_id is not None:
+            return await pool.fetchval(
+                "SELECT to_jsonb(c) - $3::text[] FROM clones c WHERE id = $1 AND creator_id = $2",
+                clone_id, creator_id, _CLONE_ROW_SKIP_COLS
+            )
+        return await pool.fetchval(
+            "SELECT to_jsonb(c) - $2::text[] FROM clones c WHERE id = $1",
+            clone_id, _CLONE_ROW_SKIP_COLS
+        )
+    
+    query = supabase_client.table("clones").select("*").eq("id", clone_id)
+    if creator_id is not None:
+        query = query.eq("creator_id", creator_id)
+    
+    response = await _execute(query)
+    return response.data[0] if response.data else None
+
+
+async def _fetch_owned_clone_rows(supabase_client, clone_ids: List[str], creator_id: str) -> List[dict]:
+    """Read the status columns of every listed clone the creator owns in one query; others are skipped"""
+    pool = get_db_pool()
+    if pool is not None:
+        records = await pool.fetch(
+            "SELECT to_jsonb(c) - $3::text[] FROM clones c WHERE id = ANY($1::uuid[]) AND creator_id = $2",
+            clone_ids, creator_id, _CLONE_STATUS_SKIP_COLS
+        )
+        return [record[0] for record in records]
+    
+    query = supabase_client.table("clones").select("*").in_("id", clone_ids).eq("creator_id", creator_id)
+    response = await _execute(query)
+    return response.data or []
+
+
+async def _load_owned_clone(supabase_client, clone_id: str, current_user_id: str, action: str) -> dict:
+    """
+    Load a full clone row that the current user created.
+    
+    The ownership check is part of the lookup; only when nothing matches is
+    a second, creator_id-only probe made to choose between 404 and 403.
+    """
+    clone_data = await _load_clone(supabase_client, clone_id, creator_id=current_user_id)
+    if clone_data is not None:
+        return clone_data
+    
+    await _get_owned_clone_or_raise(supabase_client, clone_id, current_user_id, action)
+    
+    # The clone appeared between the two reads; treat it as missing
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Clone not found"
+    )
+
+
+_rag_processor = None
+
+
+def _get_rag_processor():
+    """
+    Return the RAG wrapper's process_clone_knowledge, importing it on first use.
+    
+    The wrapper pulls in the optional RAG stack, so it is not imported with
+    this router; after the first call this is a single global lookup.
+    """
+    global _rag_processor
+    if _rag_processor is None:
+        from app.services.rag_integration_wrapper import process_clone_knowledge as run_rag_processing
+        _rag_processor = run_rag_processing
+    return _rag_processor
+
+
+def _forget_clone_row(clone_id: str):
+    """Evict a clone from the in-process row cache after it changes"""
+    _clone_row_cache.pop(clone_id, None)
+
+
+# pydantic-core's ISO 8601 parser (handles 'Z' and any fraction length)
+_parse_datetime = TypeAdapter(datetime).validate_python
+
+
+def _row_to_clone_response(row: dict) -> CloneResponse:
+    """
+    Build a CloneResponse from a raw clones row
+
+    Rows come straight from the database and already match the schema, so
+    only the timestamps are parsed and field validation is skipped.
+    """
+    g = row.get
+    published_at = g("published_at")
+    return CloneResponse.model_construct(
+        id=row["id"],
+        creator_id=row["creator_id"],
+        name=row["name"],
+        description=g("bio") or g("description") or "",  # Prefer bio column over description
+        category=row["category"],
+        expertise_areas=g("expertise_areas") or [],
+        avatar_url=g("avatar_url"),
+        base_price=float(row["base_price"]),
+        bio=g("bio"),
+        personality_traits=g("personality_traits") or {},
+        communication_style=g("communication_style") or {},
+        languages=g("languages") or ["English"],
+        average_rating=float(g("average_rating") or 0.0),
+        total_sessions=int(g("total_sessions") or 0),
+        total_earnings=float(g("total_earnings") or 0.0),
+        is_published=row["is_published"],
+        is_active=row["is_active"],
+        voice_id=g("voice_id"),
+        created_at=_parse_datetime(row["created_at"]),
+        updated_at=_parse_datetime(row["updated_at"]),
+        published_at=_parse_datetime(published_at) if published_at else None
+    )
+
+
+async def _get_owned_clone_or_raise(supabase_client, clone_id: str, current_user_id: str, action: str, columns: str = "creator_id") -> dict:
+    """
+    Fetch a clone and verify the current user created it.
+
+    Used on the slow path after an ownership-filtered write matched no rows,
+    to turn the empty result into a 404 or 403.
+    """
+    response = await _execute(supabase_client.table("clones").select(columns).eq("id", clone_id))
+    
+    if not response.data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Clone not found"
+        )
+    
+    clone_data = response.data[0]
+    
+    if clone_data["creator_id"] != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Only the creator can {action} this clone"
+        )
+    
+    return clone_data
+
+
+def _encode_cursor(row: dict) -> str:
+    """Encode an opaque keyset cursor for the (created_at, id) ordering"""
+    return base64.urlsafe_b64encode(f"{row['created_at']}|{row['id']}".encode()).decode()
+
+
+def _apply_cursor(query, cursor: str):
+    """Restrict a newest-first clones query to rows after the given cursor"""
+    try:
+        created_at, last_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        # Re-render both parts from their parsed values so only canonical
+        # timestamps and UUIDs reach the or_() filter grammar
+        created_at = _parse_datetime(created_at).isoformat()
+        last_id = str(UUID(last_id))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    
+    return query.or_(f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{last_id})')
+
+
+async def _fetch_clone_page(query, page: int, limit: int, cursor: Optional[str]):
+    """
+    Execute a clones query newest-first and build its pagination info.
+    
+    With a cursor this uses keyset pagination on (created_at, id) and skips the
+    total count; otherwise it falls back to OFFSET paging and reads the exact
+    count requested on the query.
+    """
+    if cursor:
+        query = _apply_cursor(query, cursor)
+    
+    query = query.order("created_at", desc=True).order("id", desc=True)
+    
+    if cursor:
+        # Fetch one extra row to know whether another page follows
+        response = await _execute(query.limit(limit + 1))
+        rows = response.data or []
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        total_count = None
+        total_pages = None
+        has_prev = True
+    else:
+        offset = (page - 1) * limit
+        response = await _execute(query.range(offset, offset + limit - 1))
+        rows = response.data or []
+        total_count = response.count or 0
+        total_pages = (total_count + limit - 1) // limit
+        has_next = page < total_pages
+        has_prev = page > 1
+    
+    pagination = PaginationInfo(
+        page=page,
+        limit=limit,
+        total=total_count,
+        pages=total_pages,
+        has_next=has_next,
+        has_prev=has_prev,
+        next_cursor=_encode_cursor(rows[-1]) if rows and has_next else None
+    )
+    
+    return rows, pagination
+
 
 @router.get("/test-no-auth")
 async def test_no_auth():
@@ -56,6 +475,7 @@ async def list_clones(
     price_min: Optional[float] = Query(default=None, ge=0),
     price_max: Optional[float] = Query(default=None, ge=0),
     creator_id: Optional[str] = Query(default=None),
+    cursor: Optional[str] = Query(default=None, description="Keyset cursor from pagination.next_cursor; takes precedence over page"),
     current_user_id: str = Depends(get_current_user_id),
     supabase_client = Depends(get_supabase)
 ) -> CloneListResponse:
@@ -63,8 +483,29 @@ async def list_clones(
     Get paginated list of published clones
     """
     try:
-        # Build query for published clones only
-        query = supabase_client.table("clones").select("*").eq("is_published", True).eq("is_active", True)
+        # Drop no-op filters up front so they neither reach PostgREST nor split the cache
+        category = category.strip() if category else None
+        search = search.strip() if search else None
+        if price_min == 0:
+            price_min = None  # Prices are never negative
+        
+        if creator_id:
+            try:
+                UUID(creator_id)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid creator_id"
+                )
+        
+        # Published listings are identical for every caller, so serve them from cache
+        cache_key = f"clones:list:{page}:{limit}:{category}:{search}:{price_min}:{price_max}:{creator_id}:{cursor}"
+        cached = await _cache_get(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+        
+        # Build query for published clones only (the total is only counted for page-based requests)
+        query = supabase_client.table("clones").select(_CLONE_COLS, count=None if cursor else "exact").eq("is_published", True).eq("is_active", True)
         
         # Apply filters
         if category:
@@ -80,85 +521,96 @@ async def list_clones(
             query = query.lte("base_price", price_max)
         
         if search:
-            # Search in name, description, and bio
-            query = query.or_(f"name.ilike.%{search}%,description.ilike.%{search}%,bio.ilike.%{search}%")
+            # Full-text search over name, description, and bio (GIN-indexed search_tsv column)
+            query = query.text_search("search_tsv", search, options={"config": "english", "type": "plain"})
         
-        # Get total count for pagination
-        count_response = query.execute()
-        total_count = len(count_response.data) if count_response.data else 0
+        # Apply pagination (keyset when a cursor is given, OFFSET otherwise)
+        rows, pagination = await _fetch_clone_page(query, page, limit, cursor)
         
-        # Apply pagination
-        offset = (page - 1) * limit
-        paginated_query = query.order("created_at", desc=True).range(offset, offset + limit - 1)
-        
-        response = paginated_query.execute()
+        # Convert to CloneResponse objects
+        clones = [_row_to_clone_response(clone_data) for clone_data in rows]
         
-        if not response.data:
-            response.data = []
+        payload = CloneListResponse(
+            clones=clones,
+            pagination=pagination
+        ).model_dump_json()
+        await _cache_set(cache_key, payload, CLONE_LIST_CACHE_TTL)
         
-        # Convert to CloneResponse objects
-        clones = []
-        for clone_data in response.data:
-            clones.append(CloneResponse(
-                id=clone_data["id"],
-                creator_id=clone_data["creator_id"],
-                name=clone_data["name"],
-                description=clone_data.get("bio", ""),  # Use bio column instead of description
-                category=clone_data["category"],
-                expertise_areas=clone_data.get("expertise_areas", []),
-                avatar_url=clone_data.get("avatar_url"),
-                base_price=float(clone_data["base_price"]),
-                bio=clone_data.get("bio"),
-                personality_traits=clone_data.get("personality_traits", {}),
-                communication_style=clone_data.get("communication_style", {}),
-                languages=clone_data.get("languages", ["English"]),
-                average_rating=float(clone_data.get("average_rating", 0.0)),
-                total_sessions=int(clone_data.get("total_sessions", 0)),
-                total_earnings=float(clone_data.get("total_earnings", 0.0)),
-                is_published=clone_data["is_published"],
-                is_active=clone_data["is_active"],
-                voice_id=clone_data.get("voice_id"),
-                created_at=datetime.fromisoformat(clone_data["created_at"].replace('Z', '+00:00')),
-                updated_at=datetime.fromisoformat(clone_data["updated_at"].replace('Z', '+00:00')),
-                published_at=datetime.fromisoformat(clone_data["published_at"].replace('Z', '+00:00')) if clone_data.get("published_at") else None
-            ))
-        
-        # Calculate pagination info
-        total_pages = (total_count + limit - 1) // limit
-        has_next = page < total_pages
-        has_prev = page > 1
+        return Response(content=payload, media_type="application/json")
         
-        pagination = PaginationInfo(
-            page=page,
-            limit=limit,
-            total=total_count,
-            pages=total_pages,
-            has_next=has_next,
-            has_prev=has_prev
+    except HTTPException:
+        raise
+    except (APIError, httpx.HTTPError) as e:
+        logger.error("Failed to list clones", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve clones"
         )
+
+
+@router.get("/my-clones", response_model=CloneListResponse)
+async def get_my_clones(
+    page: int = Query(default=1, ge=1),
+    limit: int = Query(default=20, ge=1, le=100),
+    published_only: Optional[bool] = Query(default=None),
+    cursor: Optional[str] = Query(default=None, description="Keyset cursor from pagination.next_cursor; takes precedence over page"),
+    current_user_id: str = Depends(get_current_user_id),
+    supabase_client = Depends(get_supabase)
+) -> CloneListResponse:
+    """
+    Get current user's clones
+    """
+    try:
+        # Build query for user's clones
+        query = supabase_client.table("clones").select(_CLONE_COLS, count=None if cursor else "exact").eq("creator_id", current_user_id)
+        
+        # Filter by published status if specified
+        if published_only is not None:
+            query = query.eq("is_published", published_only)
+        
+        # Apply pagination (keyset when a cursor is given, OFFSET otherwise)
+        rows, pagination = await _fetch_clone_page(query, page, limit, cursor)
         
-        return CloneListResponse(
+        # Convert to CloneResponse objects
+        clones = [_row_to_clone_response(clone_data) for clone_data in rows]
+        
+        payload = CloneListResponse(
             clones=clones,
             pagination=pagination
-        )
+        ).model_dump_json()
         
-    except Exception as e:
-        logger.error("Failed to list clones", error=str(e))
+        return Response(content=payload, media_type="application/json")
+        
+    except HTTPException:
+        raise
+    except (APIError, httpx.HTTPError) as e:
+        logger.error("Failed to get user clones", error=str(e), user_id=current_user_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve clones"
+            detail="Failed to retrieve user clones"
         )
 
 
 @router.get("/{clone_id}", response_model=CloneResponse)
 async def get_clone(
-    clone_id: str,
+    clone_id: CloneId,
     current_user_id: str = Depends(get_current_user_id)
 ) -> CloneResponse:
     """
     Get a specific clone by ID
     """
     try:
+        # Only published clones are cached, so a hit is visible to everyone
+        cached = _clone_body_get(clone_id)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+        
+        cache_key = f"clones:id:{clone_id}"
+        cached = await _cache_get(cache_key)
+        if cached is not None:
+            _clone_body_set(clone_id, cached)
+            return Response(content=cached, media_type="application/json")
+        
         # Use service role client to ensure clone access
         service_supabase = get_service_supabase()
         if not service_supabase:
@@ -167,16 +619,19 @@ async def get_clone(
                 detail="Service role client not available"
             )
         
-        # Fetch clone from Supabase
-        response = service_supabase.table("clones").select("*").eq("id", clone_id).execute()
-        
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Clone not found"
-            )
+        # Fetch clone from Supabase as a single object; PostgREST answers
+        # PGRST116 when no row matches
+        try:
+            response = await _execute(service_supabase.table("clones").select(_CLONE_COLS).eq("id", clone_id).single())
+        except APIError as e:
+            if e.code == "PGRST116":
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Clone not found"
+                )
+            raise
         
-        clone_data = response.data[0]
+        clone_data = response.data
         
         # Check if clone is published or if user is the creator
         if not clone_data["is_published"] and clone_data["creator_id"] != current_user_id:
@@ -185,33 +640,18 @@ async def get_clone(
                 detail="Clone not found"
             )
         
-        return CloneResponse(
-            id=clone_data["id"],
-            creator_id=clone_data["creator_id"],
-            name=clone_data["name"],
-            description=clone_data.get("bio", ""),  # Use bio column instead of description
-            category=clone_data["category"],
-            expertise_areas=clone_data.get("expertise_areas", []),
-            avatar_url=clone_data.get("avatar_url"),
-            base_price=float(clone_data["base_price"]),
-            bio=clone_data.get("bio"),
-            personality_traits=clone_data.get("personality_traits", {}),
-            communication_style=clone_data.get("communication_style", {}),
-            languages=clone_data.get("languages", ["English"]),
-            average_rating=float(clone_data.get("average_rating", 0.0)),
-            total_sessions=int(clone_data.get("total_sessions", 0)),
-            total_earnings=float(clone_data.get("total_earnings", 0.0)),
-            is_published=clone_data["is_published"],
-            is_active=clone_data["is_active"],
-            voice_id=clone_data.get("voice_id"),
-            created_at=datetime.fromisoformat(clone_data["created_at"].replace('Z', '+00:00')),
-            updated_at=datetime.fromisoformat(clone_data["updated_at"].replace('Z', '+00:00')),
-            published_at=datetime.fromisoformat(clone_data["published_at"].replace('Z', '+00:00')) if clone_data.get("published_at") and clone_data["published_at"] is not None else None
-        )
+        # Serialize once here; returning a Response skips FastAPI's response_model pass
+        payload = _row_to_clone_response(clone_data).model_dump_json()
+        
+        if clone_data["is_published"]:
+            _clone_body_set(clone_id, payload.encode())
+            await _cache_set(cache_key, payload, CLONE_CACHE_TTL)
+        
+        return Response(content=payload, media_type="application/json")
         
     except HTTPException:
         raise
-    except Exception as e:
+    except (APIError, httpx.HTTPError) as e:
         logger.error("Failed to get clone", error=str(e), clone_id=clone_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -219,90 +659,26 @@ async def get_clone(
         )
 
 
-@router.get("/my-clones", response_model=CloneListResponse)
-async def get_my_clones(
-    page: int = Query(default=1, ge=1),
-    limit: int = Query(default=20, ge=1, le=100),
-    published_only: Optional[bool] = Query(default=None),
-    current_user_id: str = Depends(get_current_user_id),
-    supabase_client = Depends(get_supabase)
-) -> CloneListResponse:
-    """
-    Get current user's clones
-    """
-    try:
-        # Build query for user's clones
-        query = supabase_client.table("clones").select("*").eq("creator_id", current_user_id)
-        
-        # Filter by published status if specified
-        if published_only is not None:
-            query = query.eq("is_published", published_only)
-        
-        # Get total count for pagination
-        count_response = query.execute()
-        total_count = len(count_response.data) if count_response.data else 0
-        
-        # Apply pagination
-        offset = (page - 1) * limit
-        paginated_query = query.order("created_at", desc=True).range(offset, offset + limit - 1)
-        
-        response = paginated_query.execute()
-        
-        if not response.data:
-            response.data = []
-        
-        # Convert to CloneResponse objects
-        clones = []
-        for clone_data in response.data:
-            clones.append(CloneResponse(
-                id=clone_data["id"],
-                creator_id=clone_data["creator_id"],
-                name=clone_data["name"],
-                description=clone_data.get("bio", ""),  # Use bio column instead of description
-                category=clone_data["category"],
-                expertise_areas=clone_data.get("expertise_areas", []),
-                avatar_url=clone_data.get("avatar_url"),
-                base_price=float(clone_data["base_price"]),
-                bio=clone_data.get("bio"),
-                personality_traits=clone_data.get("personality_traits", {}),
-                communication_style=clone_data.get("communication_style", {}),
-                languages=clone_data.get("languages", ["English"]),
-                average_rating=float(clone_data.get("average_rating", 0.0)),
-                total_sessions=int(clone_data.get("total_sessions", 0)),
-                total_earnings=float(clone_data.get("total_earnings", 0.0)),
-                is_published=clone_data["is_published"],
-                is_active=clone_data["is_active"],
-                voice_id=clone_data.get("voice_id"),
-                created_at=datetime.fromisoformat(clone_data["created_at"].replace('Z', '+00:00')),
-                updated_at=datetime.fromisoformat(clone_data["updated_at"].replace('Z', '+00:00')),
-                published_at=datetime.fromisoformat(clone_data["published_at"].replace('Z', '+00:00')) if clone_data.get("published_at") else None
-            ))
-        
-        # Calculate pagination info
-        total_pages = (total_count + limit - 1) // limit
-        has_next = page < total_pages
-        has_prev = page > 1
-        
-        pagination = PaginationInfo(
-            page=page,
-            limit=limit,
-            total=total_count,
-            pages=total_pages,
-            has_next=has_next,
-            has_prev=has_prev
-        )
-        
-        return CloneListResponse(
-            clones=clones,
-            pagination=pagination
-        )
-        
-    except Exception as e:
-        logger.error("Failed to get user clones", error=str(e), user_id=current_user_id)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve user clones"
-        )
+def _to_insert_dict(creator_id: str, clone_data: CloneCreate) -> dict:
+    """Build the clones row for a new, unpublished clone"""
+    return {
+        "id": str(uuid4()),
+        "creator_id": creator_id,
+        "name": clone_data.name,
+        "description": clone_data.description,
+        "category": clone_data.category,
+        "expertise_areas": clone_data.expertise_areas,
+        "base_price": float(clone_data.base_price),
+        "bio": clone_data.bio,
+        "personality_traits": clone_data.personality_traits,
+        "communication_style": clone_data.communication_style,
+        "languages": clone_data.languages,
+        "is_published": False,
+        "is_active": True,
+        "average_rating": 0.0,
+        "total_sessions": 0,
+        "total_earnings": 0.0
+    }
 
 
 @router.post("/", response_model=CloneResponse, status_code=status.HTTP_201_CREATED)
@@ -316,30 +692,11 @@ async def create_clone(
     """
     try:
         # Create clone data for Supabase
-        clone_id = str(uuid4())
-        clone_data_dict = {
-            "id": clone_id,
-            "creator_id": current_user_id,
-            "name": clone_data.name,
-            "description": clone_data.description,
-            "category": clone_data.category,
-            "expertise_areas": clone_data.expertise_areas,
-            "base_price": float(clone_data.base_price),
-            "bio": clone_data.bio,
-            "personality_traits": clone_data.personality_traits,
-            "communication_style": clone_data.communication_style,
-            "languages": clone_data.languages,
-            "is_published": False,
-            "is_active": True,
-            "average_rating": 0.0,
-            "total_sessions": 0,
-            "total_earnings": 0.0,
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
-        }
+        clone_data_dict = _to_insert_dict(current_user_id, clone_data)
+        clone_id = clone_data_dict["id"]
         
         # Insert into Supabase clones table
-        response = supabase_client.table("clones").insert(clone_data_dict).execute()
+        response = await _execute(supabase_client.table("clones").insert(clone_data_dict))
         
         if not response.data:
             raise HTTPException(
@@ -348,36 +705,16 @@ async def create_clone(
             )
         
         created_clone = response.data[0]
+        await _invalidate_clone_cache()
         
         logger.info("Clone created successfully in Supabase", 
                    clone_id=clone_id, 
                    creator_id=current_user_id)
         
         # Return response using created data
-        return CloneResponse(
-            id=created_clone["id"],
-            creator_id=created_clone["creator_id"],
-            name=created_clone["name"],
-            description=created_clone["description"],
-            category=created_clone["category"],
-            expertise_areas=created_clone["expertise_areas"],
-            avatar_url=created_clone.get("avatar_url"),
-            base_price=created_clone["base_price"],
-            bio=created_clone["bio"],
-            personality_traits=created_clone["personality_traits"],
-            communication_style=created_clone["communication_style"],
-            languages=created_clone["languages"],
-            average_rating=created_clone["average_rating"],
-            total_sessions=created_clone["total_sessions"],
-            total_earnings=created_clone["total_earnings"],
-            is_published=created_clone["is_published"],
-            is_active=created_clone["is_active"],
-            created_at=datetime.fromisoformat(created_clone["created_at"].replace('Z', '+00:00')),
-            updated_at=datetime.fromisoformat(created_clone["updated_at"].replace('Z', '+00:00')),
-            published_at=datetime.fromisoformat(created_clone["published_at"].replace('Z', '+00:00')) if created_clone.get("published_at") else None
-        )
+        return _row_to_clone_response(created_clone)
         
-    except Exception as e:
+    except (APIError, httpx.HTTPError) as e:
         logger.error("Clone creation failed", error=str(e), creator_id=current_user_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -385,84 +722,106 @@ async def create_clone(
         )
 
 
-@router.put("/{clone_id}", response_model=CloneResponse)
-async def update_clone(
-    clone_id: str,
-    clone_data: CloneUpdate,
+@router.post("/bulk", response_model=List[CloneResponse], status_code=status.HTTP_201_CREATED)
+async def create_clones_bulk(
+    clones_data: List[CloneCreate],
     current_user_id: str = Depends(get_current_user_id),
     supabase_client = Depends(get_supabase)
-) -> CloneResponse:
+) -> List[CloneResponse]:
     """
-    Update an existing clone (only by creator)
+    Create several clones in one insert (templates, duplication)
     """
+    if not clones_data or len(clones_data) > CLONE_BULK_CREATE_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Provide between 1 and {CLONE_BULK_CREATE_MAX} clones"
+        )
+    
     try:
-        # First check if clone exists and user owns it
-        response = supabase_client.table("clones").select("*").eq("id", clone_id).execute()
+        rows = [_to_insert_dict(current_user_id, clone_data) for clone_data in clones_data]
         
-        if not response.data:
+        # One INSERT for every row instead of a round trip per clone
+        response = await _execute(supabase_client.table("clones").insert(rows))
+        
+        if not response.data or len(response.data) != len(rows):
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Clone not found"
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to create clones in database"
             )
         
-        existing_clone = response.data[0]
+        await _invalidate_clone_cache()
         
-        # Check if user is the creator
-        if existing_clone["creator_id"] != current_user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only the creator can update this clone"
-            )
+        logger.info("Clones created successfully in Supabase", 
+                   clone_count=len(rows), 
+                   creator_id=current_user_id)
         
-        # Build update data
-        update_dict = clone_data.dict(exclude_unset=True)
-        update_dict["updated_at"] = datetime.utcnow().isoformat()
+        return [_row_to_clone_response(created_clone) for created_clone in response.data]
         
-        # If publishing for the first time, set published_at
-        if clone_data.is_published and not existing_clone.get("published_at"):
-            update_dict["published_at"] = datetime.utcnow().isoformat()
+    except HTTPException:
+        raise
+    except (APIError, httpx.HTTPError) as e:
+        logger.error("Bulk clone creation failed", error=str(e), creator_id=current_user_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create clones"
+        )
+
+
+@router.put("/{clone_id}", response_model=CloneResponse)
+async def update_clone(
+    clone_id: CloneId,
+    clone_data: CloneUpdate,
+    current_user_id: str = Depends(get_current_user_id),
+    supabase_client = Depends(get_supabase)
+) -> CloneResponse:
+    """
+    Update an existing clone (only by creator)
+    """
+    try:
+        # Build update data
+        update_dict = clone_data.model_dump(exclude_unset=True, mode="json")
+        if not update_dict:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No fields provided for update"
+            )
         
-        # Update in Supabase
-        update_response = supabase_client.table("clones").update(update_dict).eq("id", clone_id).execute()
+        # Update only if the user owns the clone; updated_at and published_at
+        # are maintained by triggers on the clones table
+        update_response = await _execute(supabase_client.table("clones").update(update_dict).eq("id", clone_id).eq("creator_id", current_user_id))
         
         if not update_response.data:
+            # Raises 404/403 if the clone is missing or owned by someone else
+            await _get_owned_clone_or_raise(supabase_client, clone_id, current_user_id, "update")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to update clone"
             )
         
         updated_clone = update_response.data[0]
+        await _invalidate_clone_cache(clone_id)
         
         logger.info("Clone updated successfully", 
                    clone_id=clone_id, 
                    creator_id=current_user_id)
         
-        return CloneResponse(
-            id=updated_clone["id"],
-            creator_id=updated_clone["creator_id"],
-            name=updated_clone["name"],
-            description=updated_clone["description"],
-            category=updated_clone["category"],
-            expertise_areas=updated_clone.get("expertise_areas", []),
-            avatar_url=updated_clone.get("avatar_url"),
-            base_price=float(updated_clone["base_price"]),
-            bio=updated_clone.get("bio"),
-            personality_traits=updated_clone.get("personality_traits", {}),
-            communication_style=updated_clone.get("communication_style", {}),
-            languages=updated_clone.get("languages", ["English"]),
-            average_rating=float(updated_clone.get("average_rating", 0.0)),
-            total_sessions=int(updated_clone.get("total_sessions", 0)),
-            total_earnings=float(updated_clone.get("total_earnings", 0.0)),
-            is_published=updated_clone["is_published"],
-            is_active=updated_clone["is_active"],
-            created_at=datetime.fromisoformat(updated_clone["created_at"].replace('Z', '+00:00')),
-            updated_at=datetime.fromisoformat(updated_clone["updated_at"].replace('Z', '+00:00')),
-            published_at=datetime.fromisoformat(updated_clone["published_at"].replace('Z', '+00:00')) if updated_clone.get("published_at") else None
-        )
+        return _row_to_clone_response(updated_clone)
         
     except HTTPException:
         raise
-    except Exception as e:
+    except APIError as e:
+        if e.code == "23514":
+            # clones_publishable: a published clone cannot lose these fields
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Published clones must keep a name, description, and category"
+            )
+        logger.error("Clone update failed", error=str(e), clone_id=clone_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update clone"
+        )
+    except httpx.HTTPError as e:
         logger.error("Clone update failed", error=str(e), clone_id=clone_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -472,7 +831,7 @@ async def update_clone(
 
 @router.delete("/{clone_id}")
 async def delete_clone(
-    clone_id: str,
+    clone_id: CloneId,
     current_user_id: str = Depends(get_current_user_id),
     supabase_client = Depends(get_supabase)
 ) -> dict:
@@ -481,9 +840,6 @@ async def delete_clone(
     Handles OpenAI resources, storage files, and database records
     """
     try:
-        # Import the comprehensive cleanup service
-        from app.services.clone_cleanup_service import cleanup_clone_comprehensive
-        
         logger.info("Starting comprehensive clone deletion", 
                    clone_id=clone_id, 
                    user_id=current_user_id)
@@ -492,6 +848,7 @@ async def delete_clone(
         cleanup_result = await cleanup_clone_comprehensive(clone_id, current_user_id)
         
         if cleanup_result["success"]:
+            await _invalidate_clone_cache(clone_id)
             logger.info("Clone deletion completed successfully", 
                        clone_id=clone_id,
                        cleanup_details=cleanup_result["cleanup_details"])
@@ -564,11 +921,9 @@ async def check_cleanup_health(
     Returns status of all required services (OpenAI, Supabase, Storage)
     """
     try:
-        from app.services.clone_cleanup_service import verify_cleanup_capability
-        
         logger.info("Checking cleanup system health", user_id=current_user_id)
         
-        capabilities = await verify_cleanup_capability()
+        capabilities = await _get_cleanup_capability()
         
         return {
             "cleanup_ready": capabilities["ready"],
@@ -601,7 +956,7 @@ async def check_cleanup_health(
 
 @router.delete("/{clone_id}/force")
 async def force_delete_clone(
-    clone_id: str,
+    clone_id: CloneId,
     current_user_id: str = Depends(get_current_user_id),
     supabase_client = Depends(get_supabase)
 ) -> dict:
@@ -610,16 +965,15 @@ async def force_delete_clone(
     Use with caution - this will terminate active sessions
     """
     try:
-        from app.services.clone_cleanup_service import CloneCleanupService
-        
         logger.warning("Force delete initiated", 
                       clone_id=clone_id, 
                       user_id=current_user_id)
         
         async with CloneCleanupService() as cleanup_service:
-            # First validate ownership (skip active session check for force delete)
+            # First validate ownership (skip active session check for force delete);
+            # the full row is handed to the cleanup service so it is read once
             try:
-                response = supabase_client.table("clones").select("*").eq("id", clone_id).execute()
+                response = await _execute(supabase_client.table("clones").select("*").eq("id", clone_id))
                 
                 if not response.data:
                     raise HTTPException(
@@ -647,19 +1001,17 @@ async def force_delete_clone(
             # Force terminate any active sessions
             terminated_sessions = 0
             try:
-                # First get count of active sessions
-                active_sessions_response = supabase_client.table("sessions").select("id").eq("clone_id", clone_id).eq("status", "active").execute()
-                active_sessions_count = len(active_sessions_response.data) if active_sessions_response.data else 0
+                # Terminate active sessions; the UPDATE returns the rows it
+                # changed, so no separate count is needed
+                now_iso = datetime.utcnow().isoformat()
+                sessions_response = await _execute(supabase_client.table("sessions").update({
+                    "status": "force_terminated",
+                    "end_time": now_iso,
+                    "updated_at": now_iso
+                }).eq("clone_id", clone_id).eq("status", "active"))
                 
-                if active_sessions_count > 0:
-                    # Terminate active sessions
-                    sessions_response = supabase_client.table("sessions").update({
-                        "status": "force_terminated",
-                        "end_time": datetime.utcnow().isoformat(),
-                        "updated_at": datetime.utcnow().isoformat()
-                    }).eq("clone_id", clone_id).eq("status", "active").execute()
-                    
-                    terminated_sessions = len(sessions_response.data) if sessions_response.data else 0
+                terminated_sessions = len(sessions_response.data) if sessions_response.data else 0
+                if terminated_sessions:
                     logger.warning(f"Force terminated {terminated_sessions} active sessions", 
                                   clone_id=clone_id)
                 
@@ -668,9 +1020,10 @@ async def force_delete_clone(
                 # Continue with deletion anyway - this shouldn't block cleanup
             
             # Now proceed with comprehensive cleanup
-            cleanup_result = await cleanup_service.cleanup_clone(clone_id, current_user_id)
+            cleanup_result = await cleanup_service.cleanup_clone(clone_id, current_user_id, existing_row=clone_data)
             
             if cleanup_result["success"]:
+                await _invalidate_clone_cache(clone_id)
                 response = {
                     "message": "Clone force deleted successfully",
                     "clone_id": clone_id,
@@ -712,7 +1065,7 @@ async def force_delete_clone(
 
 @router.get("/{clone_id}/deletion-preview")
 async def get_clone_deletion_preview(
-    clone_id: str,
+    clone_id: CloneId,
     current_user_id: str = Depends(get_current_user_id),
     supabase_client = Depends(get_supabase)
 ) -> dict:
@@ -721,7 +1074,10 @@ async def get_clone_deletion_preview(
     Shows database records, storage files, and OpenAI resources
     """
     try:
-        from app.services.clone_cleanup_service import CloneCleanupService
+        cache_key = (clone_id, current_user_id)
+        entry = _deletion_preview_cache.get(cache_key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
         
         logger.info("Generating clone deletion preview", 
                    clone_id=clone_id, 
@@ -731,8 +1087,26 @@ async def get_clone_deletion_preview(
             # Validate clone access first
             clone_data = await cleanup_service._validate_clone_access(clone_id, current_user_id)
             
-            # Gather resources that would be deleted
-            resources = await cleanup_service._gather_clone_resources(clone_id, clone_data)
+            # Gather resources that would be deleted, overlapping the active
+            # session count since neither depends on the other
+            resources, sessions_response = await asyncio.gather(
+                cleanup_service._gather_clone_resources(clone_id, clone_data),
+                _execute(supabase_client.table("sessions").select("id", count="exact", head=True).eq("clone_id", clone_id).eq("status", "active"))
+            )
+            
+            # Pull each resource list out once and derive every count from it
+            db_counts = resources["database_tables"]
+            storage_files = resources.get("storage_files", [])
+            vector_store_count = len(resources.get("vector_store_ids", []))
+            assistant_count = len(resources.get("assistant_ids", []))
+            file_urls = []
+            knowledge_document_count = 0
+            for storage_file in storage_files:
+                if len(file_urls) < DELETION_PREVIEW_MAX_FILE_URLS:
+                    file_urls.append(storage_file.get("url"))
+                if storage_file.get("type") == "knowledge_document":
+                    knowledge_document_count += 1
+            active_sessions_count = sessions_response.count or 0
             
             # Format preview data
             preview = {
@@ -744,42 +1118,34 @@ async def get_clone_deletion_preview(
                     "is_published": clone_data.get("is_published", False)
                 },
                 "database_records": {
-                    "sessions": len(resources["database_tables"].get("sessions", [])),
-                    "knowledge": len(resources["database_tables"].get("knowledge", [])),
-                    "clone_qa_training": len(resources["database_tables"].get("clone_qa_training", [])),
-                    "documents": len(resources["database_tables"].get("documents", [])),
-                    "experts": len(resources["database_tables"].get("experts", [])),
-                    "assistants": len(resources["database_tables"].get("assistants", [])),
-                    "vector_stores": len(resources["database_tables"].get("vector_stores", []))
+                    table: db_counts.get(table, 0)
+                    for table in ("sessions", "knowledge", "clone_qa_training", "documents",
+                                  "experts", "assistants", "vector_stores")
                 },
                 "storage_files": {
-                    "total_count": len(resources.get("storage_files", [])),
-                    "knowledge_documents": len([f for f in resources.get("storage_files", []) if f.get("type") == "knowledge_document"]),
+                    "total_count": len(storage_files),
+                    "knowledge_documents": knowledge_document_count,
                     "avatar": 1 if clone_data.get("avatar_url") else 0,
-                    "file_urls": [f.get("url") for f in resources.get("storage_files", [])]
+                    "file_urls": file_urls,
+                    "file_urls_truncated": len(storage_files) > len(file_urls),
+                    "file_urls_total": len(storage_files)
                 },
                 "openai_resources": {
-                    "vector_stores": len(resources.get("vector_store_ids", [])),
-                    "assistants": len(resources.get("assistant_ids", [])),
+                    "vector_stores": vector_store_count,
+                    "assistants": assistant_count,
                     "estimated_files": len(resources.get("file_ids", [])),
                     "expert_name": resources.get("expert_name", "")
                 },
                 "impact_assessment": {
-                    "has_active_sessions": False,
-                    "total_database_records": sum(len(resources["database_tables"].get(table, [])) for table in resources["database_tables"]),
-                    "total_storage_files": len(resources.get("storage_files", [])),
-                    "total_openai_resources": len(resources.get("vector_store_ids", [])) + len(resources.get("assistant_ids", [])),
+                    "has_active_sessions": active_sessions_count > 0,
+                    "active_sessions_count": active_sessions_count,
+                    "total_database_records": sum(db_counts.values()),
+                    "total_storage_files": len(storage_files),
+                    "total_openai_resources": vector_store_count + assistant_count,
                     "deletion_complexity": "simple"  # Can be simple, moderate, complex
                 }
             }
             
-            # Check for active sessions
-            sessions_response = supabase_client.table("sessions").select("id").eq("clone_id", clone_id).eq("status", "active").execute()
-            active_sessions_count = len(sessions_response.data) if sessions_response.data else 0
-            
-            preview["impact_assessment"]["has_active_sessions"] = active_sessions_count > 0
-            preview["impact_assessment"]["active_sessions_count"] = active_sessions_count
-            
             # Determine deletion complexity
             total_resources = (
                 preview["impact_assessment"]["total_database_records"] +
@@ -801,12 +1167,19 @@ async def get_clone_deletion_preview(
                        total_resources=total_resources,
                        complexity=preview["impact_assessment"]["deletion_complexity"])
             
-            return {
+            result = {
                 "success": True,
                 "clone_id": clone_id,
                 "preview": preview,
                 "timestamp": datetime.utcnow().isoformat()
             }
+            
+            _deletion_preview_cache[cache_key] = (time.monotonic() + DELETION_PREVIEW_CACHE_TTL, result)
+            _deletion_preview_cache.move_to_end(cache_key)
+            while len(_deletion_preview_cache) > DELETION_PREVIEW_CACHE_MAXSIZE:
+                _deletion_preview_cache.popitem(last=False)
+            
+            return result
         
     except Exception as e:
         logger.error("Failed to generate deletion preview", error=str(e), clone_id=clone_id)
@@ -844,7 +1217,7 @@ async def get_clone_deletion_preview(
 
 @router.post("/{clone_id}/publish")
 async def publish_clone(
-    clone_id: str,
+    clone_id: CloneId,
     current_user_id: str = Depends(get_current_user_id),
     supabase_client = Depends(get_supabase)
 ) -> dict:
@@ -852,49 +1225,39 @@ async def publish_clone(
     Publish a clone to make it publicly available
     """
     try:
-        # First check if clone exists and user owns it
-        response = supabase_client.table("clones").select("*").eq("id", clone_id).execute()
-        
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Clone not found"
-            )
-        
-        existing_clone = response.data[0]
-        
-        # Check if user is the creator
-        if existing_clone["creator_id"] != current_user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only the creator can publish this clone"
-            )
-        
-        # Validate clone has required fields for publishing
-        if not existing_clone.get("name") or not existing_clone.get("description") or not existing_clone.get("category"):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Clone must have name, description, and category to be published"
-            )
-        
-        # Update to published status
+        # Update to published status; published_at is set by the
+        # clones_set_published_at trigger if not already set
         update_data = {
-            "is_published": True,
-            "updated_at": datetime.utcnow().isoformat()
+            "is_published": True
         }
         
-        # Set published_at if not already set
-        if not existing_clone.get("published_at"):
-            update_data["published_at"] = datetime.utcnow().isoformat()
-        
-        update_response = supabase_client.table("clones").update(update_data).eq("id", clone_id).execute()
+        # Only the creator may publish; the clones_publishable constraint
+        # rejects clones without a name, description or category
+        try:
+            update_response = await _execute(
+                supabase_client.table("clones")
+                .update(update_data)
+                .eq("id", clone_id)
+                .eq("creator_id", current_user_id)
+            )
+        except APIError as e:
+            if e.code == "23514":
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Clone must have name, description, and category to be published"
+                )
+            raise
         
         if not update_response.data:
+            # Raises 404/403 if the clone is missing or owned by someone else
+            await _get_owned_clone_or_raise(supabase_client, clone_id, current_user_id, "publish")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to publish clone"
             )
         
+        await _invalidate_clone_cache(clone_id)
+        
         logger.info("Clone published successfully", 
                    clone_id=clone_id, 
                    creator_id=current_user_id)
@@ -903,7 +1266,7 @@ async def publish_clone(
         
     except HTTPException:
         raise
-    except Exception as e:
+    except (APIError, httpx.HTTPError) as e:
         logger.error("Clone publishing failed", error=str(e), clone_id=clone_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -913,7 +1276,7 @@ async def publish_clone(
 
 @router.post("/{clone_id}/unpublish")
 async def unpublish_clone(
-    clone_id: str,
+    clone_id: CloneId,
     current_user_id: str = Depends(get_current_user_id),
     supabase_client = Depends(get_supabase)
 ) -> dict:
@@ -921,47 +1284,28 @@ async def unpublish_clone(
     Unpublish a clone to make it private/draft
     """
     try:
-        # First check if clone exists and user owns it
-        response = supabase_client.table("clones").select("*").eq("id", clone_id).execute()
-        
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Clone not found"
-            )
-        
-        existing_clone = response.data[0]
-        
-        # Check if user is the creator
-        if existing_clone["creator_id"] != current_user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only the creator can unpublish this clone"
-            )
-        
-        # Check if clone has active sessions
-        sessions_response = supabase_client.table("sessions").select("id").eq("clone_id", clone_id).eq("status", "active").execute()
-        
-        if sessions_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot unpublish clone with active sessions"
-            )
-        
-        # Update to unpublished status
-        update_data = {
-            "is_published": False,
-            "updated_at": datetime.utcnow().isoformat()
-        }
-        
-        update_response = supabase_client.table("clones").update(update_data).eq("id", clone_id).execute()
+        # Unpublish in one statement, only if the user owns the clone and it
+        # has no active sessions (see the unpublish_clone migration)
+        update_response = await _execute(supabase_client.rpc("unpublish_clone", {"cid": clone_id, "uid": current_user_id}))
         
         if not update_response.data:
+            # Report missing/foreign clones before leaking session state
+            await _get_owned_clone_or_raise(supabase_client, clone_id, current_user_id, "unpublish")
+            
+            sessions_response = await _execute(supabase_client.table("sessions").select("id", count="exact", head=True).eq("clone_id", clone_id).eq("status", "active").limit(1))
+            if sessions_response.count:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cannot unpublish clone with active sessions"
+                )
+            
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to unpublish clone"
             )
         
+        await _invalidate_clone_cache(clone_id)
+        
         logger.info("Clone unpublished successfully", 
                    clone_id=clone_id, 
                    creator_id=current_user_id)
@@ -970,7 +1314,7 @@ async def unpublish_clone(
         
     except HTTPException:
         raise
-    except Exception as e:
+    except (APIError, httpx.HTTPError) as e:
         logger.error("Clone unpublishing failed", error=str(e), clone_id=clone_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -980,7 +1324,7 @@ async def unpublish_clone(
 
 @router.get("/{clone_id}/stats")
 async def get_clone_stats(
-    clone_id: str,
+    clone_id: CloneId,
     current_user_id: str = Depends(get_current_user_id),
     supabase_client = Depends(get_supabase)
 ) -> dict:
@@ -988,8 +1332,12 @@ async def get_clone_stats(
     Get statistics for a clone (only by creator)
     """
     try:
-        # First check if clone exists and user owns it
-        response = supabase_client.table("clones").select("*").eq("id", clone_id).execute()
+        # Session stats are kept up to date on the clone row by the
+        # sessions_bump_clone_stats trigger, so one read covers everything
+        response = await _execute(supabase_client.table("clones").select(
+            "creator_id, is_published, created_at, published_at, "
+            "total_sessions, total_duration_minutes, total_earnings, average_rating"
+        ).eq("id", clone_id))
         
         if not response.data:
             raise HTTPException(
@@ -1006,25 +1354,11 @@ async def get_clone_stats(
                 detail="Only the creator can view clone statistics"
             )
         
-        # Get session statistics from sessions table
-        sessions_response = supabase_client.table("sessions").select("*").eq("clone_id", clone_id).execute()
-        
-        sessions = sessions_response.data or []
-        
-        # Calculate stats
-        total_sessions = len(sessions)
-        total_minutes = sum(session.get("duration_minutes", 0) for session in sessions)
-        total_earnings = sum(session.get("total_cost", 0) for session in sessions)
-        
-        # Calculate average rating
-        ratings = [session.get("user_rating") for session in sessions if session.get("user_rating") is not None]
-        avg_rating = sum(ratings) / len(ratings) if ratings else 0.0
-        
         return {
-            "total_sessions": total_sessions,
-            "total_duration_minutes": total_minutes,
-            "total_earnings": float(total_earnings),
-            "average_rating": float(avg_rating),
+            "total_sessions": int(clone_data.get("total_sessions") or 0),
+            "total_duration_minutes": int(clone_data.get("total_duration_minutes") or 0),
+            "total_earnings": float(clone_data.get("total_earnings") or 0.0),
+            "average_rating": float(clone_data.get("average_rating") or 0.0),
             "is_published": clone_data["is_published"],
             "created_at": clone_data["created_at"],
             "published_at": clone_data.get("published_at")
@@ -1044,7 +1378,7 @@ async def get_clone_stats(
 
 @router.post("/{clone_id}/process-knowledge", response_model=KnowledgeProcessingStatus)
 async def process_clone_knowledge(
-    clone_id: str,
+    clone_id: CloneId,
     request: DocumentProcessingRequest,
     use_enhanced_rag: bool = Query(default=False, description="Use enhanced RAG processing with hybrid search"),
     chunking_strategy: str = Query(default="sentence_boundary", description="Chunking strategy: fixed_size, sentence_boundary, or semantic"),
@@ -1054,8 +1388,7 @@ async def process_clone_knowledge(
     Process knowledge documents for a clone using RAG workflow with optional enhanced features
     """
     try:
-        # Import here to avoid circular imports
-        from app.services.rag_integration_wrapper import process_clone_knowledge
+        run_rag_processing = _get_rag_processor()
         
         # Use service role client for administrative operations
         service_supabase = get_service_supabase()
@@ -1066,22 +1399,11 @@ async def process_clone_knowledge(
             )
         
         # First check if clone exists and user owns it
-        response = service_supabase.table("clones").select("*").eq("id", clone_id).execute()
+        clone_data = await _load_owned_clone(service_supabase, clone_id, current_user_id, "process knowledge for")
         
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Clone not found"
-            )
-        
-        clone_data = response.data[0]
-        
-        # Check if user is the creator
-        if clone_data["creator_id"] != current_user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only the creator can process clone knowledge"
-            )
+        # The expert is about to be rebuilt: clear the RAG ready flag (and
+        # cached answers) so queries re-read the status while it runs
+        await _invalidate_clone_cache(clone_id)
         
         # Extract clone information
         clone_name = clone_data.get("name", "Unknown Clone")
@@ -1126,11 +1448,11 @@ async def process_clone_knowledge(
                     rag_update_data = {
                         "rag_status": "completed",
                         "document_processing_status": "completed", 
-                        "rag_assistant_id": enhanced_result.get("assistant_id"),
-                        "updated_at": datetime.utcnow().isoformat()
+                        "rag_assistant_id": enhanced_result.get("assistant_id")
                     }
                     
-                    service_supabase.table("clones").update(rag_update_data).eq("id", clone_id).execute()
+                    await _execute(service_supabase.table("clones").update(rag_update_data).eq("id", clone_id))
+                    await _invalidate_clone_cache(clone_id)
                     
                     # Return enhanced processing status
                     return KnowledgeProcessingStatus(
@@ -1146,15 +1468,15 @@ async def process_clone_knowledge(
                         }
                     )
                 else:
-                    logger.warning(f"Enhanced RAG processing failed for clone {clone_id}, falling back to standard RAG")
+                    logger.warning("Enhanced RAG processing failed, falling back to standard RAG", clone_id=clone_id)
                     use_enhanced_rag = False
                     
-            except Exception as e:
-                logger.warning(f"Enhanced RAG processing failed for clone {clone_id}: {str(e)}, falling back to standard RAG")
+            except Exception:
+                logger.warning("Enhanced RAG processing failed, falling back to standard RAG", clone_id=clone_id, exc_info=True)
                 use_enhanced_rag = False
         
         # Standard RAG processing (fallback or default)
-        processing_status = await process_clone_knowledge(
+        processing_status = await run_rag_processing(
             clone_id=clone_id,
             clone_name=clone_name,
             clone_expertise=clone_expertise_str,
@@ -1168,14 +1490,14 @@ async def process_clone_knowledge(
         rag_update_data = {
             "rag_expert_name": processing_status.expert_name,
             "rag_domain_name": processing_status.domain_name,
-            "document_processing_status": processing_status.overall_status,
-            "updated_at": datetime.utcnow().isoformat()
+            "document_processing_status": processing_status.overall_status
         }
         
         if processing_status.rag_assistant_id:
             rag_update_data["rag_assistant_id"] = processing_status.rag_assistant_id
         
-        service_supabase.table("clones").update(rag_update_data).eq("id", clone_id).execute()
+        await _execute(service_supabase.table("clones").update(rag_update_data).eq("id", clone_id))
+        await _invalidate_clone_cache(clone_id)
         
         logger.info("Clone knowledge processing completed", 
                    clone_id=clone_id, 
@@ -1185,21 +1507,103 @@ async def process_clone_knowledge(
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error("Clone knowledge processing failed", error=str(e), clone_id=clone_id)
+    except Exception:
+        logger.error("Clone knowledge processing failed", clone_id=clone_id, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to process clone knowledge: {str(e)}"
+            detail="Failed to process clone knowledge"
+        )
+
+
+_processing_status_map = TypeAdapter(Dict[str, KnowledgeProcessingStatus])
+
+
+def _processing_status_from_row(clone_data: dict) -> KnowledgeProcessingStatus:
+    """
+    Build a clone's processing status from its row.
+    
+    The row comes straight from the database, so field validation is skipped.
+    """
+    overall_status = clone_data.get("document_processing_status") or "pending"
+    updated_at = clone_data.get("updated_at")
+    
+    return KnowledgeProcessingStatus.model_construct(
+        clone_id=clone_data["id"],
+        expert_name=clone_data.get("rag_expert_name") or "",
+        domain_name=clone_data.get("rag_domain_name") or "",
+        overall_status=overall_status,
+        rag_assistant_id=clone_data.get("rag_assistant_id"),
+        processing_started=updated_at,
+        processing_completed=updated_at if overall_status == "completed" else None
+    )
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (weak comparison)"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag == etag or tag == "W/" + etag:
+            return True
+    return False
+
+
+@router.post("/processing-status/batch", response_model=Dict[str, KnowledgeProcessingStatus])
+async def get_processing_status_batch(
+    request: BatchStatusRequest,
+    current_user_id: str = Depends(get_current_user_id)
+) -> Dict[str, KnowledgeProcessingStatus]:
+    """
+    Get the processing status of several clones in one request
+    
+    Returns a map of clone_id to status. Clones that do not exist or are not
+    owned by the current user are left out.
+    """
+    try:
+        clone_ids = list(dict.fromkeys(request.clone_ids))
+        for clone_id in clone_ids:
+            try:
+                UUID(clone_id)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid clone_id: {clone_id}"
+                )
+        
+        service_supabase = get_service_supabase()
+        if not service_supabase:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Service role client not available"
+            )
+        
+        rows = await _fetch_owned_clone_rows(service_supabase, clone_ids, current_user_id)
+        statuses = {row["id"]: _processing_status_from_row(row) for row in rows}
+        
+        return Response(content=_processing_status_map.dump_json(statuses), media_type="application/json")
+        
+    except HTTPException:
+        raise
+    except Exception:
+        logger.error("Failed to get batch processing status", clone_count=len(request.clone_ids), exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve processing status"
         )
 
 
 @router.get("/{clone_id}/processing-status", response_model=KnowledgeProcessingStatus)
 async def get_processing_status(
-    clone_id: str,
-    current_user_id: str = Depends(get_current_user_id)
+    clone_id: CloneId,
+    current_user_id: str = Depends(get_current_user_id),
+    if_none_match: Optional[str] = Header(None)
 ) -> KnowledgeProcessingStatus:
     """
     Get the current processing status for a clone's knowledge
+    
+    Responses carry an ETag; pollers that send it back in If-None-Match get
+    a bodyless 304 until the status changes.
     """
     try:
         # Use service role client for administrative operations
@@ -1211,40 +1615,24 @@ async def get_processing_status(
             )
         
         # First check if clone exists and user owns it
-        response = service_supabase.table("clones").select("*").eq("id", clone_id).execute()
-        
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Clone not found"
-            )
-        
-        clone_data = response.data[0]
+        clone_data = await _load_owned_clone(service_supabase, clone_id, current_user_id, "view processing status of")
         
-        # Check if user is the creator
-        if clone_data["creator_id"] != current_user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only the creator can view processing status"
-            )
+        # Polled frequently; serialize once with pydantic-core instead of
+        # re-validating through response_model. The tag is a digest of that
+        # body, so it changes exactly when a returned field does.
+        payload = _processing_status_from_row(clone_data).model_dump_json()
+        etag = '"%s"' % hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=2"}
         
-        # Get RAG information from clone data
-        processing_status = KnowledgeProcessingStatus(
-            clone_id=clone_id,
-            expert_name=clone_data.get("rag_expert_name", ""),
-            domain_name=clone_data.get("rag_domain_name", ""),
-            overall_status=clone_data.get("document_processing_status", "pending"),
-            rag_assistant_id=clone_data.get("rag_assistant_id"),
-            processing_started=clone_data.get("updated_at"),
-            processing_completed=clone_data.get("updated_at") if clone_data.get("document_processing_status") == "completed" else None
-        )
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
         
-        return processing_status
+        return Response(content=payload, media_type="application/json", headers=headers)
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error("Failed to get processing status", error=str(e), clone_id=clone_id)
+    except Exception:
+        logger.error("Failed to get processing status", clone_id=clone_id, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve processing status"
@@ -1253,18 +1641,98 @@ async def get_processing_status(
 
 
 
+async def _iter_table_rows(supabase_client, table_name: str, columns: str):
+    """Yield a table's rows page by page, ordered by id"""
+    offset = 0
+    while True:
+        response = await _execute(
+            supabase_client.table(table_name).select(columns)
+            .order("id")
+            .range(offset, offset + ORPHAN_SCAN_BATCH_SIZE - 1)
+        )
+        rows = response.data or []
+        if not rows:
+            return
+        for row in rows:
+            yield row
+        # The server may cap a page below the requested size
+        offset += len(rows)
+
+
+async def _scan_orphaned_records(supabase_client) -> dict:
+    """
+    Count orphaned sessions, knowledge and documents by comparing in Python.
+    
+    Fallback for databases without the find_orphans function; reads every
+    clone, session, knowledge and document row, one page at a time.
+    """
+    # Get all valid clone IDs. Read fresh on every scan: clones created or
+    # renamed by another worker would otherwise make their rows look orphaned.
+    valid_clone_ids = set()
+    valid_clone_names = set()
+    async for clone in _iter_table_rows(supabase_client, "clones", "id, name"):
+        valid_clone_ids.add(clone["id"])
+        valid_clone_names.add(clone["name"])
+    
+    # With no clones every row is orphaned, so let the database count them
+    if not valid_clone_ids:
+        sessions_response, knowledge_response, documents_response = await asyncio.gather(
+            _execute(supabase_client.table("sessions").select("id", count="exact", head=True)),
+            _execute(supabase_client.table("knowledge").select("id", count="exact", head=True)),
+            _execute(supabase_client.table("documents").select("id", count="exact", head=True).neq("client_name", ""))
+        )
+        return {
+            "sessions": sessions_response.count or 0,
+            "knowledge": knowledge_response.count or 0,
+            "documents": documents_response.count or 0
+        }
+    
+    # Only the counts are reported, so no orphan ids are kept
+    async def count_orphans(table_name, column, valid_values, skip_empty=False):
+        count = 0
+        async for row in _iter_table_rows(supabase_client, table_name, column):
+            value = row.get(column)
+            if skip_empty and not value:
+                continue
+            if value not in valid_values:
+                count += 1
+        return count
+    
+    # The three tables are independent, so page through them concurrently
+    sessions_count, knowledge_count, documents_count = await asyncio.gather(
+        count_orphans("sessions", "clone_id", valid_clone_ids),
+        count_orphans("knowledge", "clone_id", valid_clone_ids),
+        count_orphans("documents", "client_name", valid_clone_names, skip_empty=True)
+    )
+    
+    return {
+        "sessions": sessions_count,
+        "knowledge": knowledge_count,
+        "documents": documents_count
+    }
+
+
 @router.post("/cleanup/orphaned-data")
 async def cleanup_orphaned_data(
+    auto_cleanup: bool = Query(default=False),
+    credentials: HTTPAuthorizationCredentials = Depends(security),
     current_user_id: str = Depends(get_current_user_id),
     supabase_client = Depends(get_supabase)
 ) -> dict:
     """
     Find and clean up orphaned data across the system
     This includes RAG resources without corresponding clones, etc.
+    
+    The scan runs as anti-joins in find_orphans(); deploy it together with
+    the orphan scan indexes migration, or each probe becomes a table scan.
+    With auto_cleanup (admins only) the orphans are also deleted, in one
+    transaction, by delete_orphans().
     """
+    if auto_cleanup:
+        # Deletes across every creator's data, so it is not for regular users
+        await require_role(["admin"])(credentials, supabase_client)
+    
     try:
-        from app.services.clone_cleanup_service import CloneCleanupService
-        
         logger.info("Starting orphaned data cleanup", user_id=current_user_id)
         
         orphaned_data = {
@@ -1276,52 +1744,44 @@ async def cleanup_orphaned_data(
         
         # Find orphaned database records
         try:
-            # Get all valid clone IDs
-            valid_clones_response = supabase_client.table("clones").select("id, name").execute()
-            valid_clone_ids = [clone["id"] for clone in valid_clones_response.data] if valid_clones_response.data else []
-            valid_clone_names = [clone["name"] for clone in valid_clones_response.data] if valid_clones_response.data else []
-            
-            # Check for orphaned sessions
-            all_sessions = supabase_client.table("sessions").select("id, clone_id").execute()
-            orphaned_sessions = []
-            if all_sessions.data:
-                for session in all_sessions.data:
-                    if session["clone_id"] not in valid_clone_ids:
-                        orphaned_sessions.append(session["id"])
-            
-            # Check for orphaned knowledge entries
-            all_knowledge = supabase_client.table("knowledge").select("id, clone_id").execute()
-            orphaned_knowledge = []
-            if all_knowledge.data:
-                for knowledge in all_knowledge.data:
-                    if knowledge["clone_id"] not in valid_clone_ids:
-                        orphaned_knowledge.append(knowledge["id"])
-            
-            # Check for orphaned documents
-            all_documents = supabase_client.table("documents").select("id, client_name").execute()
-            orphaned_documents = []
-            if all_documents.data:
-                for doc in all_documents.data:
-                    if doc.get("client_name") and doc["client_name"] not in valid_clone_names:
-                        orphaned_documents.append(doc["id"])
+            # Anti-join in the database (see the find_orphans migration)
+            try:
+                orphans_response = await _execute(supabase_client.rpc("find_orphans"))
+                orphan_counts = orphans_response.data[0]
+            except Exception as e:
+                logger.warning("find_orphans unavailable, scanning in Python", error=str(e))
+                orphan_counts = await _scan_orphaned_records(supabase_client)
             
             orphaned_data["found"] = {
-                "sessions": len(orphaned_sessions),
-                "knowledge": len(orphaned_knowledge),
-                "documents": len(orphaned_documents)
+                "sessions": orphan_counts.get("sessions") or 0,
+                "knowledge": orphan_counts.get("knowledge") or 0,
+                "documents": orphan_counts.get("documents") or 0
             }
             
-            # Clean up orphaned records if requested
-            # For safety, we'll just report what was found in this version
-            # In production, you might want to add an auto_cleanup parameter
+            # Clean up orphaned records if requested; one set-based DELETE
+            # per table, all in one transaction (see delete_orphans migration)
+            if auto_cleanup and any(orphaned_data["found"].values()):
+                try:
+                    deleted_response = await _execute(supabase_client.rpc("delete_orphans"))
+                    deleted_counts = deleted_response.data[0]
+                    orphaned_data["cleaned"] = {
+                        "sessions": deleted_counts.get("sessions") or 0,
+                        "knowledge": deleted_counts.get("knowledge") or 0,
+                        "documents": deleted_counts.get("documents") or 0
+                    }
+                    logger.info("Orphaned data deleted", user_id=current_user_id, **orphaned_data["cleaned"])
+                except Exception as e:
+                    error_msg = f"Failed to delete orphaned data: {str(e)}"
+                    logger.error(error_msg)
+                    orphaned_data["errors"].append(error_msg)
             
             logger.info("Orphaned data scan completed", 
-                       orphaned_sessions=len(orphaned_sessions),
-                       orphaned_knowledge=len(orphaned_knowledge),
-                       orphaned_documents=len(orphaned_documents))
+                       orphaned_sessions=orphaned_data["found"]["sessions"],
+                       orphaned_knowledge=orphaned_data["found"]["knowledge"],
+                       orphaned_documents=orphaned_data["found"]["documents"])
             
             return {
-                "success": True,
+                "success": not orphaned_data["errors"],
                 "message": "Orphaned data scan completed",
                 "orphaned_data": orphaned_data,
                 "timestamp": datetime.utcnow().isoformat()
@@ -1350,7 +1810,7 @@ async def cleanup_orphaned_data(
 
 @router.post("/{clone_id}/retry-processing")
 async def retry_failed_processing(
-    clone_id: str,
+    clone_id: CloneId,
     current_user_id: str = Depends(get_current_user_id)
 ) -> dict:
     """
@@ -1373,48 +1833,36 @@ async def retry_failed_processing(
                    clone_id=clone_id, 
                    user_id=current_user_id)
         
-        # First check if clone exists and user owns it
-        response = service_supabase.table("clones").select("*").eq("id", clone_id).execute()
-        
-        if not response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Clone not found"
-            )
-        
-        clone_data = response.data[0]
-        
-        # Check if user is the creator
-        if clone_data["creator_id"] != current_user_id:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only the creator can retry processing"
+        # Claim the clone for processing (only if the user owns it and it is
+        # not already processing) while fetching its knowledge documents
+        claim_response, knowledge_response = await asyncio.gather(
+            _execute(service_supabase.rpc("claim_clone_processing_retry", {"cid": clone_id, "uid": current_user_id})),
+            _execute(
+                service_supabase.table("knowledge").select(
+                    "id, title, file_url, original_url, content_type, file_name, description, content_preview, metadata"
+                ).eq("clone_id", clone_id)
             )
+        )
+        await _invalidate_clone_cache(clone_id)
         
-        # Check if there are failed documents to retry
-        current_status = clone_data.get("document_processing_status")
-        logger.info("Retry processing requested", 
-                   clone_id=clone_id, 
-                   current_status=current_status,
-                   clone_name=clone_data.get("name"))
-        
-        # Allow retry for failed, partial, or even completed/pending states
-        # This provides more flexibility for users experiencing issues
-        if current_status == "processing":
-            # Already processing, return current status
+        if not claim_response.data:
+            # Raises 404/403; otherwise the clone is owned but already processing
+            await _get_owned_clone_or_raise(service_supabase, clone_id, current_user_id, "retry processing for")
             return {
                 "status": "in_progress",
                 "message": "Processing is already in progress. Please wait for completion.",
                 "clone_id": clone_id
             }
         
-        # Step 1: Fetch documents from the knowledge table for this clone_id
-        logger.debug("Fetching documents from knowledge table", clone_id=clone_id)
-        
-        knowledge_response = service_supabase.table("knowledge").select(
-            "id, title, file_url, original_url, content_type, file_name, description, content_preview, metadata"
-        ).eq("clone_id", clone_id).execute()
+        # Allow retry for failed, partial, or even completed/pending states
+        # This provides more flexibility for users experiencing issues
+        current_status = claim_response.data[0].get("previous_status")
+        logger.info("Retry processing requested", 
+                   clone_id=clone_id, 
+                   current_status=current_status,
+                   clone_name=claim_response.data[0].get("clone_name"))
         
+        # Step 1: Documents from the knowledge table were fetched above
         if not knowledge_response.data:
             logger.warning("No documents found in knowledge table for clone", 
                           clone_id=clone_id)
@@ -1422,10 +1870,10 @@ async def retry_failed_processing(
             # Still reset status to pending in case user wants to re-upload documents
             update_data = {
                 "document_processing_status": "pending",
-                "rag_status": "pending",
-                "updated_at": datetime.utcnow().isoformat()
+                "rag_status": "pending"
             }
-            service_supabase.table("clones").update(update_data).eq("id", clone_id).execute()
+            await _execute(service_supabase.table("clones").update(update_data).eq("id", clone_id))
+            await _invalidate_clone_cache(clone_id)
             
             return {
                 "status": "no_documents",
@@ -1470,9 +1918,6 @@ async def retry_failed_processing(
             elif content_preview:
                 # Content-based knowledge item - upload to Supabase storage for processing
                 try:
-                    import time
-                    from uuid import uuid4
-                    
                     # Create unique temporary filename in Supabase storage
                     temp_filename = f"temp_content_{knowledge_item.get('id')[:8]}_{int(time.time())}_{uuid4().hex[:8]}.txt"
                     temp_path = f"temp-documents/{clone_id}/{temp_filename}"
@@ -1529,6 +1974,11 @@ async def retry_failed_processing(
         
         if not document_list:
             logger.error("No valid documents found with URLs or content", clone_id=clone_id)
+            await _execute(service_supabase.table("clones").update({
+                "document_processing_status": "failed",
+                "rag_status": "failed"
+            }).eq("id", clone_id))
+            await _invalidate_clone_cache(clone_id)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No valid documents found with accessible URLs or content for processing"
@@ -1546,14 +1996,7 @@ async def retry_failed_processing(
             if hasattr(doc_info, '_temp_storage_path'):
                 temp_storage_paths.append(doc_info._temp_storage_path)
         
-        # Step 3: Reset processing status to pending and processing
-        update_data = {
-            "document_processing_status": "processing",
-            "rag_status": "processing",
-            "updated_at": datetime.utcnow().isoformat()
-        }
-        service_supabase.table("clones").update(update_data).eq("id", clone_id).execute()
-        logger.info("Clone status updated to processing", clone_id=clone_id)
+        # Step 3: The clone was already marked as processing when it was claimed above
         
         # Step 4: Trigger CleanRAGService processing
         try:
@@ -1588,8 +2031,7 @@ async def retry_failed_processing(
                 final_update_data = {
                     "document_processing_status": "completed",
                     "rag_status": "completed",
-                    "rag_assistant_id": processing_result.assistant_id,
-                    "updated_at": datetime.utcnow().isoformat()
+                    "rag_assistant_id": processing_result.assistant_id
                 }
                 
                 success_message = f"Processing retry completed successfully. Processed {processing_result.processed_documents} documents."
@@ -1602,12 +2044,12 @@ async def retry_failed_processing(
                 # Processing failed
                 final_update_data = {
                     "document_processing_status": "failed",
-                    "rag_status": "failed", 
-                    "updated_at": datetime.utcnow().isoformat()
+                    "rag_status": "failed"
                 }
                 success_message = f"Processing retry failed: {processing_result.error_message or 'Unknown error'}"
             
-            service_supabase.table("clones").update(final_update_data).eq("id", clone_id).execute()
+            await _execute(service_supabase.table("clones").update(final_update_data).eq("id", clone_id))
+            await _invalidate_clone_cache(clone_id)
             
             logger.info("Clone processing retry completed", 
                        clone_id=clone_id,
@@ -1629,11 +2071,11 @@ async def retry_failed_processing(
                 "processing_time_seconds": processing_result.processing_time_seconds
             }
             
-        except Exception as processing_error:
+        except Exception:
             # If processing fails, update clone status to failed
             logger.error("RAG processing failed during retry", 
-                        error=str(processing_error), 
-                        clone_id=clone_id)
+                        clone_id=clone_id,
+                        exc_info=True)
             
             # Clean up any temporary storage files on failure
             if 'temp_storage_paths' in locals():
@@ -1647,49 +2089,49 @@ async def retry_failed_processing(
             
             failed_update_data = {
                 "document_processing_status": "failed",
-                "rag_status": "failed",
-                "updated_at": datetime.utcnow().isoformat()
+                "rag_status": "failed"
             }
-            service_supabase.table("clones").update(failed_update_data).eq("id", clone_id).execute()
+            await _execute(service_supabase.table("clones").update(failed_update_data).eq("id", clone_id))
+            await _invalidate_clone_cache(clone_id)
             
             return {
                 "status": "failed",
-                "message": f"Processing retry failed due to RAG processing error: {str(processing_error)}",
+                "message": "Processing retry failed due to a RAG processing error",
                 "clone_id": clone_id,
                 "previous_status": current_status,
                 "new_status": "failed",
                 "documents_found": documents_found,
                 "url_based_documents": url_based_items,
                 "content_based_documents": content_based_items,
-                "error": str(processing_error)
+                "error": "rag_processing_error"
             }
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error("Failed to retry processing", error=str(e), clone_id=clone_id)
+    except Exception:
+        logger.error("Failed to retry processing", clone_id=clone_id, exc_info=True)
         
         # Try to reset clone status to failed if possible
         try:
             service_supabase = get_service_supabase()
             if service_supabase:
-                service_supabase.table("clones").update({
+                await _execute(service_supabase.table("clones").update({
                     "document_processing_status": "failed",
-                    "rag_status": "failed",
-                    "updated_at": datetime.utcnow().isoformat()
-                }).eq("id", clone_id).execute()
+                    "rag_status": "failed"
+                }).eq("id", clone_id))
+                await _invalidate_clone_cache(clone_id)
         except:
             pass  # Don't fail on status update failure
             
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to retry processing: {str(e)}"
+            detail="Failed to retry processing"
         )
 
 
 @router.post("/{clone_id}/voice/upload")
 async def upload_voice_sample(
-    clone_id: str,
+    clone_id: CloneId,
     file: UploadFile = File(...),
     voice_name: Optional[str] = None,
     description: Optional[str] = None,
@@ -1714,7 +2156,7 @@ async def upload_voice_sample(
             )
         
         # Verify clone exists and user has access
-        clone_result = service_supabase.table("clones").select("id, creator_id, name").eq("id", clone_id).execute()
+        clone_result = await _execute(service_supabase.table("clones").select("id, creator_id, name").eq("id", clone_id))
         if not clone_result.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1762,8 +2204,6 @@ async def upload_voice_sample(
         await file.seek(0)
         
         # Use ElevenLabs service to clone voice
-        from app.services.elevenlabs_service import get_elevenlabs_service
-        
         elevenlabs_service = get_elevenlabs_service()
         
         # Prepare voice name
@@ -1788,11 +2228,10 @@ async def upload_voice_sample(
         
         # Update clone with voice_id
         update_data = {
-            "voice_id": voice_id,
-            "updated_at": datetime.utcnow().isoformat()
+            "voice_id": voice_id
         }
         
-        update_result = service_supabase.table("clones").update(update_data).eq("id", clone_id).execute()
+        update_result = await _execute(service_supabase.table("clones").update(update_data).eq("id", clone_id))
         
         if not update_result.data:
             # Voice was cloned but database update failed - log warning
@@ -1803,6 +2242,8 @@ async def upload_voice_sample(
                 detail="Voice cloned but failed to update clone record"
             )
         
+        await _invalidate_clone_cache(clone_id)
+        
         logger.info("Clone updated with voice_id", 
                    clone_id=clone_id,
                    voice_id=voice_id)
@@ -1832,7 +2273,7 @@ async def upload_voice_sample(
 
 @router.post("/{clone_id}/voice/test")
 async def test_voice_synthesis(
-    clone_id: str,
+    clone_id: CloneId,
     text: str = Query(..., min_length=1, max_length=1000, description="Text to synthesize"),
     current_user_id: str = Depends(get_current_user_id)
 ):
@@ -1854,7 +2295,7 @@ async def test_voice_synthesis(
             )
         
         # Verify clone exists and user has access
-        clone_result = service_supabase.table("clones").select("id, creator_id, voice_id, name").eq("id", clone_id).execute()
+        clone_result = await _execute(service_supabase.table("clones").select("id, creator_id, voice_id, name").eq("id", clone_id))
         if not clone_result.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -1877,8 +2318,6 @@ async def test_voice_synthesis(
             )
         
         # Use ElevenLabs service to generate speech
-        from app.services.elevenlabs_service import get_elevenlabs_service
-        
         elevenlabs_service = get_elevenlabs_service()
         
         logger.info("Generating speech with ElevenLabs", 
@@ -1923,7 +2362,7 @@ async def test_voice_synthesis(
 
 @router.post("/{clone_id}/documents/upload")
 async def upload_document(
-    clone_id: str,
+    clone_id: CloneId,
     file: UploadFile = File(...),
     title: Optional[str] = None,
     description: Optional[str] = None,
@@ -1948,7 +2387,7 @@ async def upload_document(
             )
         
         # Verify clone exists and user has access
-        clone_result = service_supabase.table("clones").select("id, creator_id").eq("id", clone_id).execute()
+        clone_result = await _execute(service_supabase.table("clones").select("id, creator_id").eq("id", clone_id))
         if not clone_result.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -2014,6 +2453,7 @@ async def upload_document(
         document_title = title or file.filename
         document_description = description or f"Uploaded document: {file.filename}"
         
+        now_iso = datetime.utcnow().isoformat()
         knowledge_data = {
             "clone_id": clone_id,
             "title": document_title,
@@ -2025,13 +2465,13 @@ async def upload_document(
             "file_size_bytes": len(file_content),
             "vector_store_status": "pending",
             "rag_processing_status": "pending",
-            "created_at": datetime.utcnow().isoformat(),
-            "updated_at": datetime.utcnow().isoformat()
+            "created_at": now_iso,
+            "updated_at": now_iso
         }
         
         logger.info("Creating knowledge entry", clone_id=clone_id, title=document_title)
         
-        knowledge_result = service_supabase.table("knowledge").insert(knowledge_data).execute()
+        knowledge_result = await _execute(service_supabase.table("knowledge").insert(knowledge_data))
         
         if not knowledge_result.data:
             # Clean up uploaded file if database insert fails
@@ -2047,6 +2487,7 @@ async def upload_document(
             )
         
         knowledge_entry = knowledge_result.data[0]
+        await _invalidate_clone_cache(clone_id)
         
         logger.info("Document uploaded successfully", 
                    clone_id=clone_id,
@@ -2082,7 +2523,7 @@ async def upload_document(
 
 @router.delete("/{clone_id}/documents/{document_id}")
 async def delete_document(
-    clone_id: str,
+    clone_id: CloneId,
     document_id: str,
     current_user_id: str = Depends(get_current_user_id)
 ):
@@ -2104,7 +2545,7 @@ async def delete_document(
             )
         
         # Verify clone exists and user has access
-        clone_result = service_supabase.table("clones").select("id, creator_id").eq("id", clone_id).execute()
+        clone_result = await _execute(service_supabase.table("clones").select("id, creator_id").eq("id", clone_id))
         if not clone_result.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -2119,7 +2560,7 @@ async def delete_document(
             )
         
         # Get document information
-        knowledge_result = service_supabase.table("knowledge").select("*").eq("id", document_id).eq("clone_id", clone_id).execute()
+        knowledge_result = await _execute(service_supabase.table("knowledge").select("*").eq("id", document_id).eq("clone_id", clone_id))
         if not knowledge_result.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -2143,7 +2584,6 @@ async def delete_document(
         # 2. Delete OpenAI resources (vector store and assistants) if they exist
         if document.get("openai_vector_store_id") or document.get("openai_assistant_id"):
             try:
-                from app.services.rag_client import RAGClient
                 rag_client = RAGClient()
                 
                 # Delete vector store
@@ -2171,18 +2611,19 @@ async def delete_document(
             rag_supabase = get_rag_supabase()
             if rag_supabase:
                 # Delete from documents table where the name matches
-                delete_result = rag_supabase.table("documents").delete().eq("name", document.get("title", "")).execute()
+                delete_result = await _execute(rag_supabase.table("documents").delete().eq("name", document.get("title", "")))
                 logger.info("Related documents deleted from RAG system", count=len(delete_result.data))
         except Exception as rag_db_error:
             logger.warning("Failed to delete from RAG documents table", error=str(rag_db_error))
         
         # 4. Delete from knowledge table (main record)
-        delete_result = service_supabase.table("knowledge").delete().eq("id", document_id).execute()
+        delete_result = await _execute(service_supabase.table("knowledge").delete().eq("id", document_id))
         if not delete_result.data:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to delete document record"
             )
+        await _invalidate_clone_cache(clone_id)
         
         logger.info("Document deleted successfully", 
                    clone_id=clone_id,
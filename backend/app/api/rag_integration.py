@@ -3,7 +3,9 @@ RAG Integration API endpoints
 Handles RAG initialization, querying, and management for CloneAI
 """
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
-from typing import List, Optional, Dict, Any
+from fastapi.responses import Response
+from typing import List, Optional, Dict, Any, Tuple
+import asyncio
 from datetime import datetime
 import structlog
 
@@ -14,10 +16,15 @@ from app.models.schemas import (
     InitializationStatusResponse, SuccessResponse
 )
 from app.services.rag_integration_service import rag_integration_service
+from app.services.rag_cache import rag_response_cache, embed_query
+from app.services.openai_service import openai_service
 
 logger = structlog.get_logger()
 router = APIRouter(prefix="/rag", tags=["RAG Integration"])
 
+# In-flight RAG queries, so duplicate submissions share one upstream call
+_inflight_queries: Dict[Tuple[str, str, str, Optional[str]], asyncio.Future] = {}
+
 
 @router.post("/clones/{clone_id}/initialize", response_model=RAGInitializationResponse)
 async def initialize_clone_rag(
@@ -38,6 +45,8 @@ async def initialize_clone_rag(
         
         logger.info("Starting RAG initialization", clone_id=clone_id, user_id=current_user_id)
         
+        rag_response_cache.invalidate(clone_id)
+        
         response = await rag_integration_service.initialize_clone_rag(
             clone_id=clone_id,
             user_id=current_user_id,
@@ -87,6 +96,7 @@ async def query_clone_rag(
     Sends a query to the clone's RAG system. The system will attempt to use
     the memory layer first, with fallback to standard LLM if needed.
     """
+    start_time = datetime.utcnow()
     try:
         # Extract parameters from request body
         query = request.query
@@ -100,19 +110,70 @@ async def query_clone_rag(
         # Note: We don't verify clone ownership here since users can query clones they don't own
         # during chat sessions
         
-        response = await rag_integration_service.query_clone_rag(
+        # Serve near-duplicate questions from the semantic cache. Queries with
+        # conversation context are not cached since the answer depends on it.
+        embedding = None
+        if not context and openai_service.is_available():
+            try:
+                embedding = await embed_query(query, user_id=current_user_id)
+            except Exception as e:
+                logger.warning("Query embedding failed, skipping RAG cache", clone_id=clone_id, error=str(e))
+            
+            if embedding is not None:
+                cached_answer = rag_response_cache.lookup(clone_id, embedding)
+                if cached_answer is not None:
+                    logger.info("RAG cache hit", clone_id=clone_id)
+                    response = await rag_integration_service.replay_cached_answer(
+                        clone_id=clone_id,
+                        query=query,
+                        user_id=current_user_id,
+                        answer=cached_answer,
+                        start_time=start_time,
+                        session_id=session_id
+                    )
+                    return Response(content=response.model_dump_json(), media_type="application/json")
+        
+        # Coalesce identical context-free queries from the same user and session
+        # (double submits, retries) into a single RAG call
+        inflight_key = (clone_id, query, current_user_id, session_id)
+        pending = _inflight_queries.get(inflight_key) if not context else None
+        if pending is not None:
+            return await asyncio.shield(pending)
+        
+        pending = asyncio.ensure_future(rag_integration_service.query_clone_rag(
             clone_id=clone_id,
             query=query,
             user_id=current_user_id,
             session_id=session_id,
             context=context or {}
-        )
-        
-        return response
-        
-    except Exception as e:
-        logger.error("Failed to query RAG system", clone_id=clone_id, error=str(e))
-        raise HTTPException(status_code=500, detail=f"Failed to process query: {str(e)}")
+        ))
+        if not context:
+            _inflight_queries[inflight_key] = pending
+        try:
+            response = await asyncio.shield(pending)
+        finally:
+            if _inflight_queries.get(inflight_key) is pending:
+                del _inflight_queries[inflight_key]
+        
+        # Only cache answers that came from the clone's knowledge. The cache is
+        # shared across users, so it keeps the answer alone; thread, timing and
+        # token fields are rebuilt per request on a hit.
+        if (embedding is not None and response.rag_data is not None
+                and response.query_type in ("memory", "enhanced")):
+            rag_response_cache.insert(clone_id, embedding, {
+                "content": response.content,
+                "query_type": response.query_type,
+                "confidence_score": response.confidence_score,
+                "rag_response": response.rag_data.response,
+                "sources": response.rag_data.sources,
+            })
+
+        # Serialize with pydantic-core, skipping another pass through response_model
+        return Response(content=response.model_dump_json(), media_type="application/json")
+        
+    except Exception:
+        logger.error("Failed to query RAG system", clone_id=clone_id, exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to process query")
 
 
 @router.put("/clones/{clone_id}/update", response_model=RAGUpdateResponse)
@@ -139,6 +200,7 @@ async def update_clone_rag_documents(
             knowledge_ids=knowledge_ids,
             operation=operation
         )
+        rag_response_cache.invalidate(clone_id)
         
         return RAGUpdateResponse(
             status=result["status"],
@@ -1,6 +1,7 @@
 """
 Supabase database connection and session management for CloneAI
 """
+import json
 import os
 from typing import Optional
 import structlog
@@ -13,6 +14,20 @@ except ImportError:
     Client = None
     create_client = None
 
+try:
+    import asyncpg
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    ASYNCPG_AVAILABLE = False
+    asyncpg = None
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    aioredis = None
+
 from app.config import settings
 
 logger = structlog.get_logger()
@@ -20,6 +35,15 @@ logger = structlog.get_logger()
 # Global Supabase client
 supabase_client: Optional[Client] = None
 
+# Global service role Supabase client (created lazily, then reused)
+service_supabase_client: Optional[Client] = None
+
+# Global asyncpg pool (optional - direct reads for hot paths)
+db_pool = None
+
+# Global Redis client (optional - used for response caching)
+redis_client = None
+
 
 class DatabaseManager:
     """Simplified database manager using only Supabase"""
@@ -102,16 +126,24 @@ def get_service_supabase() -> Optional[Client]:
     """
     Get Supabase client with service role that bypasses RLS
     Use this for administrative operations like RAG processing
+    
+    The client is shared so its HTTP sessions (and their keep-alive
+    connections) are reused instead of re-handshaking on every request.
     """
+    global service_supabase_client
+    
     if not SUPABASE_AVAILABLE or not settings.SUPABASE_URL or not settings.SUPABASE_SERVICE_KEY:
         return None
     
+    if service_supabase_client is not None:
+        return service_supabase_client
+    
     try:
-        client = create_client(
+        service_supabase_client = create_client(
             settings.SUPABASE_URL,
             settings.SUPABASE_SERVICE_KEY
         )
-        return client
+        return service_supabase_client
     except Exception as e:
         logger.error("Failed to create service Supabase client", error=str(e))
         return None
@@ -150,6 +182,105 @@ def get_authenticated_supabase(authorization: str = None) -> Optional[Client]:
         return db_manager.get_supabase()
 
 
+async def _init_db_connection(connection):
+    """Decode json/jsonb columns to Python objects, as PostgREST does"""
+    for type_name in ("json", "jsonb"):
+        await connection.set_type_codec(
+            type_name,
+            encoder=json.dumps,
+            decoder=json.loads,
+            schema="pg_catalog"
+        )
+
+
+async def init_db_pool() -> bool:
+    """
+    Open an asyncpg pool on DATABASE_URL for direct reads.
+    
+    The pool is optional: without DATABASE_URL (or asyncpg) callers of
+    get_db_pool() get None and keep using the Supabase client.
+    """
+    global db_pool
+    
+    if not ASYNCPG_AVAILABLE or not settings.DATABASE_URL:
+        logger.info("DATABASE_URL not configured - direct database pool disabled")
+        return False
+    
+    # Accept SQLAlchemy-style URLs (postgresql+asyncpg://...)
+    dsn = settings.DATABASE_URL.replace("+asyncpg", "", 1)
+    
+    try:
+        db_pool = await asyncpg.create_pool(
+            dsn,
+            min_size=2,
+            max_size=20,
+            max_inactive_connection_lifetime=300,
+            # Supabase's transaction pooler (port 6543) cannot keep
+            # prepared statements across transactions
+            statement_cache_size=0 if ":6543/" in dsn else 1024,
+            init=_init_db_connection
+        )
+        logger.info("Database pool initialized successfully")
+        return True
+    except Exception as e:
+        logger.warning("Failed to create database pool - using Supabase client", error=str(e))
+        db_pool = None
+        return False
+
+
+async def close_db_pool():
+    """Close the asyncpg pool if one was opened"""
+    global db_pool
+    
+    if db_pool is not None:
+        await db_pool.close()
+        db_pool = None
+
+
+def get_db_pool():
+    """Get the asyncpg pool, or None when direct database access is disabled"""
+    return db_pool
+
+
+async def init_redis() -> bool:
+    """
+    Connect to Redis for caching.
+    
+    Redis is optional: if it is not installed or not reachable the app keeps
+    running and callers of get_redis() simply get None.
+    """
+    global redis_client
+    
+    if not REDIS_AVAILABLE or not settings.REDIS_URL:
+        logger.warning("Redis not available - caching disabled")
+        return False
+    
+    try:
+        client = aioredis.from_url(settings.REDIS_URL)
+        await client.ping()
+        redis_client = client
+        logger.info("Redis client initialized successfully")
+        return True
+    except Exception as e:
+        logger.warning("Failed to connect to Redis - caching disabled", error=str(e))
+        redis_client = None
+        return False
+
+
+async def close_redis():
+    """Close the Redis connection if one was opened"""
+    global redis_client
+    
+    if redis_client is not None:
+        await redis_client.close()
+        redis_client = None
+
+
+def get_redis():
+    """Get the Redis client, or None when caching is disabled"""
+    return redis_client
+
+
 async def get_db_session():
     """Legacy compatibility function - SQLAlchemy sessions no longer used
     
@@ -16,7 +16,7 @@ from fastapi.responses import JSONResponse
 from app.config import settings, validate_settings
 
 # Import database and security
-from app.database import init_database, close_database, test_all_connections, db_manager
+from app.database import init_database, close_database, test_all_connections, db_manager, init_redis, close_redis, get_redis, init_db_pool, close_db_pool
 from app.core.security import get_security_headers
 
 # Import API routers
@@ -100,9 +100,13 @@ async def lifespan(app: FastAPI):
         connection_results = await test_all_connections()
         logger.info("Database connection tests completed", results=connection_results)
         
-        # Initialize Redis connection (will be implemented later)
-        # await init_redis()
-        logger.info("Redis connection ready")
+        # Initialize direct database pool (optional, used for hot read paths)
+        if await init_db_pool():
+            logger.info("Database pool ready")
+        
+        # Initialize Redis connection (optional, used for caching)
+        if await init_redis():
+            logger.info("Redis connection ready")
         
         # Initialize RAG client
         from app.services.rag_client import rag_client
@@ -126,8 +130,11 @@ async def lifespan(app: FastAPI):
         # await close_database()
         logger.info("Database connections closed")
         
+        # Close direct database pool
+        await close_db_pool()
+        
         # Close Redis connection  
-        # await close_redis()
+        await close_redis()
         logger.info("Redis connection closed")
         
         # Close RAG client
@@ -135,6 +142,10 @@ async def lifespan(app: FastAPI):
         await cleanup_rag_client()
         logger.info("RAG client closed")
         
+        # Close RAG core OpenAI connections
+        from app.services.rag_core_service import rag_core_service
+        await rag_core_service.close()
+        
     except Exception as e:
         logger.error("Error during shutdown", error=str(e))
 
@@ -250,10 +261,10 @@ async def detailed_health_check() -> Dict[str, Any]:
             "message": f"Supabase client error: {str(e)}"
         }
     
-    # Check Redis (placeholder)
+    # Check Redis (optional cache)
     health_status["services"]["redis"] = {
-        "status": "healthy", 
-        "message": "Redis connection ready"
+        "status": "healthy" if get_redis() is not None else "disabled", 
+        "message": "Redis connection ready" if get_redis() is not None else "Redis not connected - caching disabled"
     }
     
     # Storage buckets check (placeholder)
@@ -376,10 +376,11 @@ class PaginationInfo(BaseSchema):
     """Pagination information"""
     page: int
     limit: int
-    total: int
-    pages: int
+    total: Optional[int] = None  # Not counted for cursor-based requests
+    pages: Optional[int] = None
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
 
 
 # Clone schemas
@@ -798,6 +799,11 @@ class KnowledgeProcessingStatus(BaseSchema):
     error_message: Optional[str] = None
 
 
+class BatchStatusRequest(BaseSchema):
+    """Request for the processing status of several clones at once"""
+    clone_ids: List[str] = Field(..., min_length=1, max_length=100)
+
+
 class RAGQueryRequest(BaseSchema):
     """Request for querying RAG expert"""
     query: str = Field(..., min_length=1, max_length=2000)
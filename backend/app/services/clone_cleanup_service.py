@@ -10,6 +10,7 @@ import logging
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import structlog
+from postgrest.exceptions import APIError
 
 from ..database import get_supabase, get_service_supabase
 from ..config import settings
@@ -92,13 +93,16 @@ class CloneCleanupService:
             logger.info("Cleanup completed successfully", 
                        results=self.cleanup_results)
     
-    async def cleanup_clone(self, clone_id: str, user_id: str) -> Dict[str, Any]:
+    async def cleanup_clone(self, clone_id: str, user_id: str, existing_row: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Main cleanup function that orchestrates complete clone deletion
         
         Args:
             clone_id: ID of the clone to delete
             user_id: ID of the user requesting deletion (for authorization)
+            existing_row: Full clone row the caller already fetched and
+                authorized; skips the access validation (and its active
+                session check)
             
         Returns:
             Dictionary with cleanup results and any errors/warnings
@@ -108,7 +112,10 @@ class CloneCleanupService:
         
         try:
             # Step 1: Validate clone exists and user has permission
-            clone_data = await self._validate_clone_access(clone_id, user_id)
+            if existing_row is not None:
+                clone_data = existing_row
+            else:
+                clone_data = await self._validate_clone_access(clone_id, user_id)
             
             # Step 2: Gather all related resource information before deletion
             resources = await self._gather_clone_resources(clone_id, clone_data)
@@ -116,7 +123,7 @@ class CloneCleanupService:
             # Step 3: Perform cleanup in specific order to handle dependencies
             await self._cleanup_openai_resources(resources)
             await self._cleanup_storage_files(clone_id, clone_data)
-            await self._cleanup_database_records(clone_id, clone_data)
+            await self._cleanup_database_records(clone_id, clone_data, user_id)
             
             # Step 4: Verify cleanup completion
             await self._verify_cleanup_completion(clone_id)
@@ -153,7 +160,7 @@ class CloneCleanupService:
     async def _validate_clone_access(self, clone_id: str, user_id: str) -> Dict[str, Any]:
         """Validate clone exists and user has permission to delete it"""
         try:
-            response = self.supabase.table("clones").select("*").eq("id", clone_id).execute()
+            response = await asyncio.to_thread(self.supabase.table("clones").select("*").eq("id", clone_id).execute)
             
             if not response.data:
                 raise CleanupError(f"Clone {clone_id} not found", recoverable=False)
@@ -166,10 +173,10 @@ class CloneCleanupService:
                                  recoverable=False)
             
             # Check for active sessions
-            sessions_response = self.supabase.table("sessions").select("id").eq("clone_id", clone_id).eq("status", "active").execute()
+            sessions_response = await asyncio.to_thread(self.supabase.table("sessions").select("id", count="exact", head=True).eq("clone_id", clone_id).eq("status", "active").limit(1).execute)
             
-            if sessions_response.data:
-                raise CleanupError(f"Cannot delete clone {clone_id} with {len(sessions_response.data)} active sessions", 
+            if sessions_response.count:
+                raise CleanupError(f"Cannot delete clone {clone_id} with {sessions_response.count} active sessions", 
                                  recoverable=False)
             
             logger.info("Clone validation successful", clone_id=clone_id, clone_name=clone_data.get("name"))
@@ -190,13 +197,13 @@ class CloneCleanupService:
             "file_ids": [],
             "storage_files": [],
             "database_tables": {
-                "knowledge": [],
-                "documents": [],
-                "experts": [],
-                "assistants": [],
-                "vector_stores": [],
-                "sessions": [],
-                "clone_qa_training": []
+                "knowledge": 0,
+                "documents": 0,
+                "experts": 0,
+                "assistants": 0,
+                "vector_stores": 0,
+                "sessions": 0,
+                "clone_qa_training": 0
             }
         }
         
@@ -208,7 +215,7 @@ class CloneCleanupService:
             
             # Gather OpenAI resource IDs
             if self.openai_client:
-                await self._gather_openai_resources(clone_id, resources)
+                await self._gather_openai_resources(clone_id, clone_data, resources)
             
             # Gather storage file information
             await self._gather_storage_resources(clone_id, clone_data, resources)
@@ -229,16 +236,16 @@ class CloneCleanupService:
             # Continue with partial resource information
             return resources
     
-    async def _gather_openai_resources(self, clone_id: str, resources: Dict[str, Any]):
+    async def _gather_openai_resources(self, clone_id: str, clone_data: Dict[str, Any], resources: Dict[str, Any]):
         """Gather OpenAI vector store and assistant IDs"""
         try:
             expert_name = resources["expert_name"]
             clone_name = resources["clone_name"]
             
             # Get vector store IDs from database with multiple search patterns
-            vector_response = self.supabase.table("vector_stores").select("vector_id, file_ids").or_(
+            vector_response = await asyncio.to_thread(self.supabase.table("vector_stores").select("vector_id, file_ids").or_(
                 f"expert_name.eq.{expert_name},client_name.eq.{clone_name}"
-            ).execute()
+            ).execute)
             
             for vs in vector_response.data or []:
                 if vs.get("vector_id"):
@@ -249,18 +256,16 @@ class CloneCleanupService:
                         resources["file_ids"].extend(file_ids)
             
             # Get assistant IDs from database
-            assistant_response = self.supabase.table("assistants").select("assistant_id").eq("expert_name", expert_name).execute()
+            assistant_response = await asyncio.to_thread(self.supabase.table("assistants").select("assistant_id").eq("expert_name", expert_name).execute)
             
             for assistant in assistant_response.data or []:
                 if assistant.get("assistant_id"):
                     resources["assistant_ids"].append(assistant["assistant_id"])
             
-            # Also check clone's RAG assistant ID from clones table
-            clone_response = self.supabase.table("clones").select("rag_assistant_id").eq("id", clone_id).execute()
-            if clone_response.data and clone_response.data[0].get("rag_assistant_id"):
-                rag_assistant_id = clone_response.data[0]["rag_assistant_id"]
-                if rag_assistant_id not in resources["assistant_ids"]:
-                    resources["assistant_ids"].append(rag_assistant_id)
+            # Also check clone's RAG assistant ID from the clone row
+            rag_assistant_id = clone_data.get("rag_assistant_id")
+            if rag_assistant_id and rag_assistant_id not in resources["assistant_ids"]:
+                resources["assistant_ids"].append(rag_assistant_id)
             
             # Search for OpenAI resources by name patterns if expert_name is available
             if self.openai_client and expert_name:
@@ -294,7 +299,7 @@ class CloneCleanupService:
         """Gather Supabase storage file paths for deletion"""
         try:
             # Knowledge documents from storage
-            knowledge_response = self.supabase.table("knowledge").select("file_url").eq("clone_id", clone_id).execute()
+            knowledge_response = await asyncio.to_thread(self.supabase.table("knowledge").select("file_url").eq("clone_id", clone_id).execute)
             
             for knowledge in knowledge_response.data or []:
                 file_url = knowledge.get("file_url")
@@ -324,6 +329,21 @@ class CloneCleanupService:
             clone_name = clone_data.get("name", "")
             expert_name = resources["expert_name"]
             
+            # One round trip for every count (see clone_resource_counts migration)
+            try:
+                counts_response = await asyncio.to_thread(self.supabase.rpc("clone_resource_counts", {
+                    "cid": clone_id,
+                    "clone_name": clone_name or None,
+                    "expert_name": expert_name or None
+                }).execute)
+                if counts_response.data:
+                    counts = counts_response.data[0]
+                    for table_name in resources["database_tables"]:
+                        resources["database_tables"][table_name] = counts.get(table_name) or 0
+                    return
+            except Exception as e:
+                logger.debug("clone_resource_counts unavailable, counting per table", error=str(e))
+            
             # Count records in each table
             tables_to_check = [
                 ("knowledge", [("clone_id", clone_id)]),
@@ -335,23 +355,38 @@ class CloneCleanupService:
                 ("vector_stores", [("expert_name", expert_name)])
             ]
             
-            for table_name, conditions in tables_to_check:
+            async def count_records(table_name, conditions):
+                # An empty name links to nothing; without it the query would
+                # count the whole table
+                if not all(value for _, value in conditions):
+                    resources["database_tables"][table_name] = 0
+                    return
+                
                 try:
-                    query = self.supabase.table(table_name).select("id")
+                    # HEAD request: only the count comes back, not the rows.
+                    # Estimated counts are exact for small results and fall
+                    # back to the planner's estimate for large ones, which is
+                    # all the preview's complexity buckets need.
+                    query = self.supabase.table(table_name).select("id", count="estimated", head=True)
                     for field, value in conditions:
-                        if value:  # Only add condition if value is not empty
-                            query = query.eq(field, value)
+                        query = query.eq(field, value)
                     
-                    response = query.execute()
-                    count = len(response.data) if response.data else 0
-                    resources["database_tables"][table_name] = response.data or []
+                    response = await asyncio.to_thread(query.execute)
+                    count = response.count or 0
+                    resources["database_tables"][table_name] = count
                     
                     logger.debug(f"Found {count} records in {table_name}", 
                                table=table_name, count=count)
                     
                 except Exception as e:
                     logger.warning(f"Failed to count records in {table_name}", error=str(e))
-                    resources["database_tables"][table_name] = []
+                    resources["database_tables"][table_name] = 0
+            
+            # The counts are independent, so issue them concurrently
+            await asyncio.gather(*(
+                count_records(table_name, conditions)
+                for table_name, conditions in tables_to_check
+            ))
                     
         except Exception as e:
             logger.warning("Failed to gather database resource counts", error=str(e))
@@ -478,7 +513,7 @@ class CloneCleanupService:
             self.cleanup_results["errors"].append(error_msg)
             self.cleanup_results["storage"] = {"success": False, "error": str(e)}
     
-    async def _cleanup_database_records(self, clone_id: str, clone_data: Dict[str, Any]):
+    async def _cleanup_database_records(self, clone_id: str, clone_data: Dict[str, Any], user_id: str):
         """Clean up database records in correct order to handle foreign key constraints"""
         try:
             logger.info("Starting database cleanup", clone_id=clone_id)
@@ -488,6 +523,42 @@ class CloneCleanupService:
             
             deleted_counts = {}
             
+            # Delete everything in one transaction (see the
+            # delete_clone_cascade migration); the per-table sequence below
+            # is only used where the function is not deployed yet
+            try:
+                cascade_response = await asyncio.to_thread(self.supabase.rpc("delete_clone_cascade", {
+                    "cid": clone_id,
+                    "uid": user_id,
+                    "clone_name": clone_name or None,
+                    "expert_name": expert_name or None
+                }).execute)
+            except APIError as e:
+                # PGRST202: function not found
+                if e.code != "PGRST202":
+                    raise
+                logger.debug("delete_clone_cascade unavailable, deleting per table", error=str(e))
+            else:
+                if not cascade_response.data:
+                    # No rows back means the clone was missing or not owned by
+                    # the user, and nothing was deleted
+                    raise CleanupError(
+                        "Clone not found or not owned by user; no database records were deleted",
+                        recoverable=False,
+                        details={"clone_id": clone_id}
+                    )
+                
+                for row in cascade_response.data or []:
+                    table_name = row["table_name"]
+                    deleted_counts[table_name] = deleted_counts.get(table_name, 0) + (row.get("deleted_count") or 0)
+                
+                logger.info("Deleted clone records", clone_id=clone_id, tables=deleted_counts)
+                self.cleanup_results["database"] = {
+                    "tables_cleaned": deleted_counts,
+                    "success": True
+                }
+                return
+            
             # Delete in specific order to handle foreign key relationships
             cleanup_sequence = [
                 # First: Delete referencing records
@@ -563,6 +634,10 @@ class CloneCleanupService:
                 "success": True  # Consider success if we completed without critical errors
             }
             
+        except CleanupError as e:
+            self.cleanup_results["errors"].append(str(e))
+            self.cleanup_results["database"] = {"success": False, "error": str(e)}
+            raise
         except Exception as e:
             error_msg = f"Database cleanup failed: {str(e)}"
             logger.error(error_msg)
@@ -0,0 +1,159 @@
+"""
+RAG Response Cache
+Approximate (semantic) cache of RAG answers keyed by query embedding
+"""
+import hashlib
+import time
+from typing import Any, List, Optional
+
+import numpy as np
+import structlog
+
+from app.config import settings
+from app.database import get_redis
+from app.services.openai_service import openai_service
+
+logger = structlog.get_logger()
+
+# Query embeddings cached in Redis by content hash (seconds)
+EMBEDDING_CACHE_TTL = 86400
+
+# Cached RAG answers (seconds). The cache is per process, so this bounds how
+# long other workers can serve answers from before a knowledge change.
+RAG_RESPONSE_CACHE_TTL = 600
+
+
+class ProximityCache:
+    """
+    Cache RAG responses per clone and serve them for near-duplicate queries.
+
+    Embeddings are kept L2-normalized in one (rows, dim) float32 matrix, so a
+    lookup is a single matrix-vector product; cosine distance is then
+    1 - similarity. The matrix starts small and doubles up to capacity as
+    entries are added. Entries expire after ttl seconds; when full, an
+    expired slot is reused, else the least recently used one.
+    """
+
+    INITIAL_ROWS = 256
+
+    def __init__(self, capacity: int = 10_000, tau: float = 0.05, ttl: float = RAG_RESPONSE_CACHE_TTL):
+        self.capacity = capacity
+        self.tau = tau
+        self.ttl = ttl
+        self._embeddings: Optional[np.ndarray] = None
+        self._clone_ids = np.empty(capacity, dtype=object)
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._expires_at = np.zeros(capacity, dtype=np.float64)
+        self._responses: List[Any] = [None] * capacity
+        self._size = 0
+        self._tick = 0
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, clone_id: str, embedding) -> Optional[Any]:
+        """Return the cached response closest to the query, if within tau"""
+        if self._size == 0:
+            return None
+
+        query = self._normalize(embedding)
+        if query.shape[0] != self._embeddings.shape[1]:
+            return None
+
+        distances = 1.0 - self._embeddings[:self._size] @ query
+        distances[self._clone_ids[:self._size] != clone_id] = np.inf
+        distances[self._expires_at[:self._size] <= time.monotonic()] = np.inf
+
+        best = int(np.argmin(distances))
+        if distances[best] > self.tau:
+            return None
+
+        self._tick += 1
+        self._last_used[best] = self._tick
+        return self._responses[best]
+
+    def insert(self, clone_id: str, embedding, response: Any):
+        """Cache a response for a query embedding"""
+        vector = self._normalize(embedding)
+
+        if self._embeddings is None or self._embeddings.shape[1] != vector.shape[0]:
+            # First insert (or embedding model changed): size the matrix
+            self._embeddings = np.zeros((min(self.INITIAL_ROWS, self.capacity), vector.shape[0]), dtype=np.float32)
+            self._clone_ids[:] = None
+            self._responses = [None] * self.capacity
+            self._expires_at[:] = 0
+            self._size = 0
+
+        if self._size < self.capacity:
+            slot = self._size
+            self._size += 1
+            if slot == self._embeddings.shape[0]:
+                grown = np.zeros((min(2 * slot, self.capacity), vector.shape[0]), dtype=np.float32)
+                grown[:slot] = self._embeddings
+                self._embeddings = grown
+        else:
+            # Prefer an expired (or invalidated) slot over a live one
+            expired = np.flatnonzero(self._expires_at <= time.monotonic())
+            slot = int(expired[0]) if expired.size else int(np.argmin(self._last_used))
+
+        self._tick += 1
+        self._embeddings[slot] = vector
+        self._clone_ids[slot] = clone_id
+        self._responses[slot] = response
+        self._last_used[slot] = self._tick
+        self._expires_at[slot] = time.monotonic() + self.ttl
+
+    def invalidate(self, clone_id: str):
+        """Drop every cached response for a clone (e.g. after its documents change)"""
+        if self._size == 0:
+            return
+
+        slots = np.flatnonzero(self._clone_ids[:self._size] == clone_id)
+        for slot in slots:
+            self._clone_ids[slot] = None
+            self._responses[slot] = None
+            self._expires_at[slot] = 0
+            # Reuse freed slots before evicting live entries
+            self._last_used[slot] = 0
+
+        if len(slots):
+            logger.info("Invalidated cached RAG responses", clone_id=clone_id, count=len(slots))
+
+
+# Global RAG response cache instance
+rag_response_cache = ProximityCache()
+
+
+async def embed_query(text: str, user_id: Optional[str] = None) -> np.ndarray:
+    """
+    Embed a query, reusing the embedding of an identical earlier query.
+    
+    Embeddings are stored in Redis as float16 bytes under a 16-byte blake2b
+    digest of the model and text; the precision loss is far below the cache's
+    distance threshold. Redis failures fall through to the provider.
+    """
+    model = getattr(settings, 'EMBEDDING_MODEL', 'text-embedding-3-small')
+    key = b"emb:" + hashlib.blake2b(f"{model}\0{text}".encode(), digest_size=16).digest()
+    
+    redis = get_redis()
+    if redis is not None:
+        try:
+            cached = await redis.get(key)
+            if cached is not None:
+                return np.frombuffer(cached, dtype=np.float16).astype(np.float32)
+        except Exception as e:
+            logger.warning("Embedding cache read failed", error=str(e))
+    
+    embedding_response = await openai_service.create_embeddings(text, model=model, user_id=user_id)
+    embedding = np.asarray(embedding_response["data"][0]["embedding"], dtype=np.float32)
+    
+    if redis is not None:
+        try:
+            await redis.set(key, embedding.astype(np.float16).tobytes(), ex=EMBEDDING_CACHE_TTL)
+        except Exception as e:
+            logger.warning("Embedding cache write failed", error=str(e))
+    
+    return embedding
@@ -7,11 +7,12 @@ import json
 import asyncio
 from datetime import datetime
 from typing import Dict, List, Any, Optional
+import httpx
 import structlog
 
 from app.config import settings
 from app.database import get_service_supabase
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from supabase import create_client
 
 logger = structlog.get_logger()
@@ -22,6 +23,19 @@ class RAGCoreService:
         # Initialize OpenAI client
         self.openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
         
+        # Async client for the query path, on one long-lived connection pool so
+        # chat queries reuse warm TLS connections instead of blocking the event
+        # loop on the sync client. Retries stay bounded (the SDK backs off with
+        # jitter) so an OpenAI outage is not amplified.
+        self.async_openai_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            max_retries=2,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+                timeout=httpx.Timeout(30.0, connect=2.0, write=5.0, pool=2.0)
+            )
+        )
+        
         # Initialize Supabase clients
         self.service_supabase = get_service_supabase()
         
@@ -153,24 +167,19 @@ class RAGCoreService:
             
             assistant_id = assistant_info["assistant_id"]
             
-            # Create thread for this conversation
-            thread = self.openai_client.beta.threads.create()
-            
-            # Add message to thread
-            self.openai_client.beta.threads.messages.create(
-                thread_id=thread.id,
-                role="user",
-                content=query
+            # Create thread for this conversation with the message already in it
+            thread = await self.async_openai_client.beta.threads.create(
+                messages=[{"role": "user", "content": query}]
             )
             
             # Run the assistant
-            run = self.openai_client.beta.threads.runs.create_and_poll(
+            run = await self.async_openai_client.beta.threads.runs.create_and_poll(
                 thread_id=thread.id,
                 assistant_id=assistant_id
             )
             
             # Get the response
-            messages = self.openai_client.beta.threads.messages.list(
+            messages = await self.async_openai_client.beta.threads.messages.list(
                 thread_id=thread.id
             )
             
@@ -192,6 +201,10 @@ class RAGCoreService:
             logger.error("Expert query failed", expert_name=expert_name, error=str(e))
             raise e
     
+    async def close(self):
+        """Close the async OpenAI client's connection pool"""
+        await self.async_openai_client.close()
+    
     async def get_expert_status(self, expert_name: str) -> Dict[str, Any]:
         """Get status of expert initialization"""
         try:
@@ -385,7 +398,8 @@ class RAGCoreService:
                         "document_link": doc.get("file_url"),
                         "openai_file_id": file.id,
                         "domain": domain_name,  # Use the actual domain from clone category
-                        "client_name": doc.get("clone_id")
+                        "client_name": doc.get("clone_id"),
+                        "clone_id": doc.get("clone_id")
                     }
                     
                     # Delete existing document with same name for this client
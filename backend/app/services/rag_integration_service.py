@@ -11,16 +11,22 @@ import structlog
 
 from supabase import create_client
 from app.config import settings
+from app.database import get_redis
 from app.services.rag_client import rag_client, RAGServiceError, RAGTimeoutError
 from app.services.rag_core_service import rag_core_service
 from app.models.schemas import (
-    RAGDocument, RAGQueryRequestEnhanced, RAGQueryResponseEnhanced,
+    RAGDocument, RAGQueryResponseEnhanced,
     RAGInitializationResponse, RAGStatusResponse, EnhancedChatResponse,
     RAGSource
 )
 
 logger = structlog.get_logger()
 
+# Redis flag set once a clone's RAG expert is ready; cleared on reinitialize,
+# status changes and clone updates (see app/api/clones.py)
+RAG_READY_KEY = "clones:rag_ready:{clone_id}"
+RAG_READY_TTL = 3600
+
 class RAGIntegrationService:
     def __init__(self):
         # Use service role key for backend operations
@@ -52,6 +58,9 @@ class RAGIntegrationService:
         if not documents:
             raise ValueError("No documents found for clone")
         
+        # Queries must not use the expert while it is being rebuilt
+        await self._forget_rag_ready(clone_id)
+        
         # Create initialization record
         initialization_id = str(uuid.uuid4())
         await self._create_initialization_record(
@@ -91,35 +100,32 @@ class RAGIntegrationService:
         
         start_time = datetime.utcnow()
         
-        # Check if RAG is available for this clone
-        rag_status = await self.get_clone_rag_status(clone_id)
-        
-        if not rag_status.is_ready:
-            # Fallback to standard chat
-            return await self._fallback_response(query, context)
+        # Check if RAG is available for this clone - a ready clone stays ready
+        # until it is reinitialized, so skip the status reads once it is known
+        if not await self._is_rag_ready_cached(clone_id):
+            rag_status = await self.get_clone_rag_status(clone_id)
+            
+            if not rag_status.is_ready:
+                # Fallback to standard chat
+                return await self._fallback_response(query, context)
+            
+            await self._cache_rag_ready(clone_id)
         
         try:
-            # Prepare RAG request
-            rag_request = RAGQueryRequestEnhanced(
-                expert_name=clone_id,
-                query=query,
-                context=context or {},
-                options={
-                    "use_memory_layer": True,
-                    "use_llm_fallback": False,
-                    "max_tokens": 1500,
-                    "temperature": 0.7,
-                    "include_sources": True
-                },
-                personality_config=await self._get_personality_config(clone_id)
-            )
+            options = {
+                "use_memory_layer": True,
+                "use_llm_fallback": False,
+                "max_tokens": 1500,
+                "temperature": 0.7,
+                "include_sources": True
+            }
             
             # Query RAG system using internal core service
             core_response = await rag_core_service.query_expert(
                 expert_name=clone_id,
                 query=query,
                 context=context or {},
-                options=rag_request.options
+                options=options
             )
             
             # Convert core response to enhanced RAG response format
@@ -181,6 +187,47 @@ class RAGIntegrationService:
             logger.error("Unexpected error in RAG query", clone_id=clone_id, error=str(e))
             return await self._fallback_response(query, context, error="system_error")
     
+    async def replay_cached_answer(
+        self,
+        clone_id: str,
+        query: str,
+        user_id: str,
+        answer: Dict[str, Any],
+        start_time: datetime,
+        session_id: Optional[str] = None
+    ) -> EnhancedChatResponse:
+        """
+        Build a response from a semantic-cache hit.
+
+        The cache holds only the answer (content, confidence, sources); thread,
+        timing and token fields belong to this request, and no tokens are spent.
+        The query is logged like any other so analytics include cache hits.
+        """
+        response_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+
+        rag_response = RAGQueryResponseEnhanced(
+            response=answer["rag_response"],
+            confidence_score=answer["confidence_score"],
+            sources=answer["sources"],
+            query_type="expert_query",
+            used_memory_layer=True,
+            used_llm_fallback=False,
+            used_personality_enhancement=False,
+            response_time_ms=response_time,
+            tokens_used=0
+        )
+
+        await self._log_rag_query(clone_id, user_id, session_id, query, rag_response)
+
+        return EnhancedChatResponse(
+            content=answer["content"],
+            query_type=answer["query_type"],
+            rag_data=rag_response,
+            confidence_score=rag_response.confidence_score,
+            response_time_ms=response_time,
+            tokens_used=0
+        )
+
     async def update_clone_rag_documents(
         self,
         clone_id: str,
@@ -216,12 +263,43 @@ class RAGIntegrationService:
             await self._update_rag_document_status(knowledge_ids, "failed", str(e))
             raise
     
+    async def _is_rag_ready_cached(self, clone_id: str) -> bool:
+        """Check the Redis ready flag (False when Redis is disabled or unreachable)"""
+        redis = get_redis()
+        if redis is None:
+            return False
+        try:
+            return bool(await redis.exists(RAG_READY_KEY.format(clone_id=clone_id)))
+        except Exception as e:
+            logger.warning("RAG ready flag read failed", error=str(e), clone_id=clone_id)
+            return False
+    
+    async def _cache_rag_ready(self, clone_id: str):
+        """Remember that the clone's RAG expert is ready"""
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.set(RAG_READY_KEY.format(clone_id=clone_id), 1, ex=RAG_READY_TTL)
+        except Exception as e:
+            logger.warning("RAG ready flag write failed", error=str(e), clone_id=clone_id)
+    
+    async def _forget_rag_ready(self, clone_id: str):
+        """Clear the ready flag so the next query re-reads the status"""
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.delete(RAG_READY_KEY.format(clone_id=clone_id))
+        except Exception as e:
+            logger.warning("RAG ready flag invalidation failed", error=str(e), clone_id=clone_id)
+    
     async def get_clone_rag_status(self, clone_id: str) -> RAGStatusResponse:
         """Get RAG status for a clone"""
         
         try:
             # Get clone info
-            clone_result = self.supabase.table("clones").select("rag_enabled, rag_status, rag_document_count, rag_last_sync").eq("id", clone_id).single().execute()
+            clone_result = await asyncio.to_thread(self.supabase.table("clones").select("rag_enabled, rag_status, rag_document_count, rag_last_sync").eq("id", clone_id).single().execute)
             
             if not clone_result.data or not clone_result.data.get("rag_enabled"):
                 return RAGStatusResponse(
@@ -233,7 +311,7 @@ class RAGIntegrationService:
             clone_data = clone_result.data
             
             # Get expert info (use execute() instead of single() to handle 0 rows)
-            expert_result = self.supabase.table("rag_experts").select("*").eq("clone_id", clone_id).execute()
+            expert_result = await asyncio.to_thread(self.supabase.table("rag_experts").select("*").eq("clone_id", clone_id).execute)
             
             if expert_result.data and len(expert_result.data) > 0:
                 expert_data = expert_result.data[0]  # Get first (and only) result
@@ -249,7 +327,7 @@ class RAGIntegrationService:
             else:
                 # No expert record exists, check if there's an active initialization
                 try:
-                    init_result = self.supabase.table("rag_initializations").select("*").eq("clone_id", clone_id).order("created_at", desc=True).limit(1).execute()
+                    init_result = await asyncio.to_thread(self.supabase.table("rag_initializations").select("*").eq("clone_id", clone_id).order("created_at", desc=True).limit(1).execute)
                     
                     if init_result.data and len(init_result.data) > 0:
                         latest_init = init_result.data[0]
@@ -574,11 +652,12 @@ class RAGIntegrationService:
             update_data["rag_document_count"] = doc_count
         
         self.supabase.table("clones").update(update_data).eq("id", clone_id).execute()
+        await self._forget_rag_ready(clone_id)
     
     async def _log_rag_query(self, clone_id: str, user_id: str, session_id: Optional[str], query: str, response: RAGQueryResponseEnhanced):
         """Log RAG query session"""
         try:
-            self.supabase.table("rag_query_sessions").insert({
+            await asyncio.to_thread(self.supabase.table("rag_query_sessions").insert({
                 "clone_id": clone_id,
                 "user_id": user_id,
                 "session_id": session_id,
@@ -591,23 +670,10 @@ class RAGIntegrationService:
                 "source_documents": [source.dict() for source in response.sources],
                 "tokens_used": response.tokens_used,
                 "response_time_ms": response.response_time_ms
-            }).execute()
+            }).execute)
         except Exception as e:
             logger.warning("Failed to log RAG query", error=str(e))
     
-    async def _get_personality_config(self, clone_id: str) -> Dict[str, Any]:
-        """Get personality configuration for clone"""
-        result = self.supabase.table("clones").select("personality_traits, communication_style, system_prompt, temperature").eq("id", clone_id).single().execute()
-        
-        if result.data:
-            return {
-                "personality_traits": result.data.get("personality_traits", {}),
-                "communication_style": result.data.get("communication_style", {}),
-                "system_prompt": result.data.get("system_prompt", ""),
-                "temperature": result.data.get("temperature", 0.7)
-            }
-        return {}
-    
     async def _enhance_with_llm(self, rag_response: RAGQueryResponseEnhanced, query: str, context: Dict) -> str:
         """Enhance RAG response with LLM (placeholder for now)"""
         # For now, return RAG response as-is